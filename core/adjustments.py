@@ -0,0 +1,151 @@
+# core/adjustments.py
+from django.db import transaction
+from django.utils import timezone
+
+from .dashboard import invalidate_dashboard_snapshot
+from .events import notify_inventory_changed
+from .list_cache import bump_list_generation
+from .models import InventoryItem, InventoryItemChanges, StockAlert, StockMovement
+from .orders import _case_by_pk
+
+# Largest number of operations accepted in one batch request
+ADJUSTMENT_MAX_OPERATIONS = 1000
+# Items written per UPDATE ... CASE statement
+ADJUSTMENT_BATCH_SIZE = 500
+
+
+def _non_negative_int(value, name):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f'{name} must be a whole number.')
+    if value < 0:
+        raise ValueError(f'{name} cannot be negative.')
+    return value
+
+
+def _write_items(items, now):
+    """Store quantity, threshold and status of the items with one UPDATE per ADJUSTMENT_BATCH_SIZE items."""
+    for start in range(0, len(items), ADJUSTMENT_BATCH_SIZE):
+        batch = items[start:start + ADJUSTMENT_BATCH_SIZE]
+        InventoryItem.objects.filter(pk__in=[item.pk for item in batch]).update(
+            quantity=_case_by_pk({item.pk: item.quantity for item in batch}),
+            threshold=_case_by_pk({item.pk: item.threshold for item in batch}),
+            status=_case_by_pk({item.pk: item.status for item in batch}),
+            date_modified=now,
+        )
+
+
+def clean_adjustments(operations):
+    """
+    Validate a list of {"id", "quantity" | "delta", "threshold"} operations. Returns
+    (cleaned operations, {index: error message}); the operations are only usable without errors.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError('Expected a non-empty list of operations.')
+    if len(operations) > ADJUSTMENT_MAX_OPERATIONS:
+        raise ValueError(f'At most {ADJUSTMENT_MAX_OPERATIONS} operations are accepted per request.')
+
+    cleaned, errors = [], {}
+    for index, operation in enumerate(operations):
+        try:
+            if not isinstance(operation, dict):
+                raise ValueError('Each operation must be an object.')
+            item_id = operation.get('id')
+            if isinstance(item_id, bool) or not isinstance(item_id, int):
+                raise ValueError('id must be an item id.')
+            if 'quantity' in operation and 'delta' in operation:
+                raise ValueError('Give either quantity or delta, not both.')
+            if not any(key in operation for key in ('quantity', 'delta', 'threshold')):
+                raise ValueError('Nothing to change; give quantity, delta or threshold.')
+            delta = operation.get('delta')
+            if delta is not None and (isinstance(delta, bool) or not isinstance(delta, int)):
+                raise ValueError('delta must be a whole number.')
+            cleaned.append({
+                'id': item_id,
+                'quantity': _non_negative_int(operation['quantity'], 'quantity') if 'quantity' in operation else None,
+                'delta': delta,
+                'threshold': _non_negative_int(operation['threshold'], 'threshold') if 'threshold' in operation else None,
+            })
+        except ValueError as e:
+            errors[index] = str(e)
+    return cleaned, errors
+
+
+def apply_adjustments(operations, user=None):
+    """
+    Apply cleaned operations in one transaction, in order (several may touch the same item).
+    The items are locked and read with one SELECT, written with batched UPDATEs, and every quantity
+    change is logged with one bulk INSERT. If any operation fails, e.g. an unknown id or a delta
+    taking stock below zero, nothing is written.
+
+    Returns (applied, results) with one result per operation: the item's new values, or an error.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        items = InventoryItem.objects.select_for_update().in_bulk({operation['id'] for operation in operations})
+        original_statuses = {pk: item.status for pk, item in items.items()}
+
+        results, changes, failed = [], [], False
+        for operation in operations:
+            item = items.get(operation['id'])
+            if item is None:
+                results.append({'id': operation['id'], 'success': False, 'error': 'Item not found.'})
+                failed = True
+                continue
+
+            quantity = item.quantity
+            if operation['quantity'] is not None:
+                quantity = operation['quantity']
+            elif operation['delta'] is not None:
+                quantity = item.quantity + operation['delta']
+            if quantity < 0:
+                results.append({'id': item.pk, 'success': False, 'error': f'Quantity would drop below zero ({quantity}).'})
+                failed = True
+                continue
+
+            old_quantity = item.quantity
+            item.quantity = quantity
+            if operation['threshold'] is not None:
+                item.threshold = operation['threshold']
+            item.status = item.calculate_inv_status()
+            if quantity != old_quantity:
+                changes.append(InventoryItemChanges(
+                    item=item,
+                    old_value=old_quantity,
+                    new_value=quantity,
+                    status=item.status,
+                    executing_user=user,
+                ))
+            results.append({
+                'id': item.pk,
+                'success': True,
+                'quantity': item.quantity,
+                'threshold': item.threshold,
+                'status': item.status,
+                'status_text': item.get_status_display(),
+            })
+
+        if failed:
+            transaction.set_rollback(True)
+            return False, [
+                result if not result['success']
+                else {'id': result['id'], 'success': False, 'error': 'Not applied; another operation in the batch failed.'}
+                for result in results
+            ]
+
+        touched = [items[pk] for pk in sorted({operation['id'] for operation in operations})]
+        for item in touched:
+            # Delta sync relies on date_modified, which only save() sets by itself
+            item.date_modified = now
+        _write_items(touched, now)
+        InventoryItemChanges.objects.bulk_create(changes, batch_size=ADJUSTMENT_BATCH_SIZE)
+        StockMovement.record(
+            [(change.item_id, change.new_value - change.old_value) for change in changes],
+            StockMovement.ADJUSTMENT, user=user, moment=now,
+        )
+        StockAlert.record_status_changes([(item, original_statuses[item.pk]) for item in touched])
+        bump_list_generation(InventoryItem)
+        notify_inventory_changed()
+
+    # The UPDATE doesn't send the save signals that refresh the dashboard
+    invalidate_dashboard_snapshot()
+    return True, results
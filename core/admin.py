@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile, Supplier, InventoryItem, Order, OrderItem, Changelog, InventoryItemChanges
+from .models import Profile, Supplier, InventoryItem, Order, OrderItem, Changelog, InventoryItemChanges, ImportJob, ChangeArchive, StockMovement, StockSnapshot
 
 # Customize Profile admin to show user, role, and bio in the list view
 class ProfileAdmin(admin.ModelAdmin):
@@ -19,7 +19,28 @@ class OrderAdmin(admin.ModelAdmin):
 
 # Customize OrderItem admin to display order item details
 class OrderItemAdmin(admin.ModelAdmin):
-    list_display = ('order', 'product_name', 'quantity')
+    list_display = ('order', 'product_name', 'item', 'quantity')
+    list_select_related = ('order', 'item')
+
+# Customize ImportJob admin to show import progress
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('file_name', 'status', 'processed_rows', 'total_rows', 'created_by', 'date_added')
+
+# Customize ChangeArchive admin to show archived history batches
+class ChangeArchiveAdmin(admin.ModelAdmin):
+    list_display = ('source', 'period', 'row_count', 'first_executed', 'last_executed', 'date_archived')
+    list_filter = ('source',)
+
+# Customize StockMovement admin to show the stock ledger
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ('item', 'delta', 'reason', 'executing_user', 'date_created')
+    list_filter = ('reason',)
+    list_select_related = ('item', 'executing_user')
+
+# Customize StockSnapshot admin to show periodic stock snapshots
+class StockSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('item', 'quantity', 'taken_at')
+    list_select_related = ('item',)
 
 admin.site.register(Profile, ProfileAdmin)
 admin.site.register(Supplier, SupplierAdmin)
@@ -28,3 +49,7 @@ admin.site.register(Order, OrderAdmin)
 admin.site.register(OrderItem, OrderItemAdmin)
 admin.site.register(Changelog)
 admin.site.register(InventoryItemChanges)
+admin.site.register(ImportJob, ImportJobAdmin)
+admin.site.register(ChangeArchive, ChangeArchiveAdmin)
+admin.site.register(StockMovement, StockMovementAdmin)
+admin.site.register(StockSnapshot, StockSnapshotAdmin)
@@ -0,0 +1,33 @@
+# core/alerts.py
+from django.db.models import Exists, F, OuterRef
+
+from .models import InventoryItem, StockAlert, StockAlertAcknowledgement
+
+def open_alerts(user=None, limit=None):
+    """
+    Open stock alerts joined with their items, out of stock first, as a list of dicts keyed like
+    inventory rows ('id' is the item id). With a user, alerts that user has acknowledged are left out.
+    """
+    # Driven by the join to the (small) open-alert table rather than a scan of inventory by status
+    items = InventoryItem.objects.filter(stock_alert__isnull=False)
+    if user is not None:
+        items = items.exclude(Exists(StockAlertAcknowledgement.objects.filter(alert__item=OuterRef('pk'), user=user)))
+    rows = items.order_by('stock_alert__status', 'name', 'id').values(
+        'id', 'name', 'quantity', 'threshold', 'status', date_opened=F('stock_alert__date_opened'),
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    rows = list(rows)
+    for row in rows:
+        row['status_text'] = InventoryItem.INV_STATUS_CHOICES.get(row['status'], "Unknown")
+    return rows
+
+
+def acknowledge_alerts(user, item_ids):
+    """Acknowledge the open alerts of the given items for a user. Returns the number of alerts found."""
+    alert_ids = list(StockAlert.objects.filter(item_id__in=item_ids).values_list('id', flat=True))
+    StockAlertAcknowledgement.objects.bulk_create(
+        [StockAlertAcknowledgement(alert_id=alert_id, user=user) for alert_id in alert_ids],
+        ignore_conflicts=True,
+    )
+    return len(alert_ids)
@@ -0,0 +1,134 @@
+# core/archive.py
+import gzip
+import json
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ChangeArchive, Changelog, InventoryItemChanges
+
+# Rows moved per transaction; each batch is one SELECT, one INSERT and one DELETE
+ARCHIVE_BATCH_SIZE = 1000
+
+# Per source: the model and the values() columns kept in the archive. Item and user names are
+# copied in so archived rows stay readable after the item or user is deleted.
+ARCHIVE_SOURCES = {
+    ChangeArchive.INVENTORY_CHANGES: (
+        InventoryItemChanges,
+        ('id', 'item_id', 'old_value', 'new_value', 'status', 'executing_user_id', 'date_executed'),
+        {'item_name': F('item__name'), 'executing_username': F('executing_user__username')},
+    ),
+    ChangeArchive.CHANGELOG: (
+        Changelog,
+        ('id', 'model_name', 'record_id', 'field_name', 'old_value', 'new_value', 'changes', 'executing_user_id', 'date_executed'),
+        {'executing_username': F('executing_user__username')},
+    ),
+}
+
+
+def retention_cutoff(days=None):
+    """Rows executed before this moment are due for archival."""
+    if days is None:
+        days = settings.CHANGELOG_RETENTION_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def _period(moment):
+    return moment.astimezone(dt_timezone.utc).date().replace(day=1)
+
+
+def _compress(rows):
+    lines = "\n".join(json.dumps(row, cls=DjangoJSONEncoder, separators=(',', ':')) for row in rows)
+    return gzip.compress(lines.encode('utf-8'))
+
+
+def _decompress(data):
+    return [json.loads(line) for line in gzip.decompress(bytes(data)).decode('utf-8').splitlines() if line]
+
+
+def archive_batch(source, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move up to batch_size of the oldest rows executed before `cutoff` into ChangeArchive, one
+    archive row per month. The copy and the delete commit together, and the transaction only
+    covers this one batch. Returns the number of rows archived.
+    """
+    model, fields, names = ARCHIVE_SOURCES[source]
+    with transaction.atomic():
+        rows = list(
+            model.objects.filter(date_executed__lt=cutoff)
+            .order_by('date_executed', 'id')
+            .values(*fields, **names)[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        by_period = {}
+        for row in rows:
+            by_period.setdefault(_period(row['date_executed']), []).append(row)
+        ChangeArchive.objects.bulk_create([
+            ChangeArchive(
+                source=source,
+                period=period,
+                first_executed=period_rows[0]['date_executed'],
+                last_executed=period_rows[-1]['date_executed'],
+                row_count=len(period_rows),
+                data=_compress(period_rows),
+            )
+            for period, period_rows in by_period.items()
+        ])
+        model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_history(source, cutoff, batch_size=ARCHIVE_BATCH_SIZE, pause=0.0):
+    """
+    Archive every row of `source` executed before `cutoff` in batches, sleeping `pause` seconds
+    between batches to ease load on the database. Returns the total archived.
+    """
+    total = 0
+    while True:
+        archived = archive_batch(source, cutoff, batch_size)
+        if not archived:
+            break
+        total += archived
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def read_archive(source, start=None, end=None, item_id=None, limit=None):
+    """
+    Return archived rows of `source`, newest first, executed between `start` and `end` (inclusive
+    datetimes, either may be None). `item_id` narrows inventory changes to one item. Only the
+    archive batches overlapping the date range are decompressed.
+    """
+    batches = ChangeArchive.objects.filter(source=source).order_by('-last_executed', '-id')
+    if start is not None:
+        batches = batches.filter(last_executed__gte=start)
+    if end is not None:
+        batches = batches.filter(first_executed__lte=end)
+
+    results = []
+    for data in batches.values_list('data', flat=True).iterator():
+        rows = []
+        for row in _decompress(data):
+            executed = parse_datetime(row['date_executed'])
+            if start is not None and executed < start:
+                continue
+            if end is not None and executed > end:
+                continue
+            if item_id is not None and row.get('item_id') != item_id:
+                continue
+            rows.append(row)
+        rows.reverse()
+        results.extend(rows)
+        if limit is not None and len(results) >= limit:
+            break
+    results.sort(key=lambda row: (row['date_executed'], row['id']), reverse=True)
+    return results[:limit] if limit is not None else results
@@ -0,0 +1,79 @@
+# core/conditional.py
+import hashlib
+import time
+from calendar import timegm
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# How long the first time a validator was seen is remembered; forgetting it only costs a 200
+VALIDATOR_SEEN_TTL = 24 * 60 * 60
+
+
+def _first_seen(etag):
+    """
+    Unix time this validator was first served. Deleting a row lowers the count without raising
+    max(date_modified), so Last-Modified must also move forward whenever the ETag changes.
+    """
+    key = f'conditional:seen:{etag}'
+    now = int(time.time())
+    if cache.add(key, now, VALIDATOR_SEEN_TTL):
+        return now
+    return cache.get(key, now)
+
+
+class ConditionalGetMixin:
+    """
+    Answers If-None-Match / If-Modified-Since on the list and detail routes of a viewset with a
+    304 before anything is serialized. The validator is one aggregate query over the filtered
+    queryset: max(`conditional_field`) and the row count, combined with the query string, the
+    route and the chosen renderer into an ETag.
+    """
+    conditional_field = 'date_modified'
+
+    def _validators(self, queryset, *parts):
+        stats = queryset.aggregate(latest=Max(self.conditional_field), count=Count('pk'))
+        latest = stats['latest']
+        raw = '|'.join(map(str, (
+            latest.isoformat() if latest else '', stats['count'], self.request.GET.urlencode(),
+            self.request.accepted_renderer.format, *parts,
+        )))
+        etag = quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+        last_modified = _first_seen(etag)
+        if latest is not None:
+            last_modified = max(last_modified, timegm(latest.utctimetuple()))
+        return stats['count'], etag, last_modified
+
+    def _conditional(self, request, handler, queryset, parts, *args, **kwargs):
+        count, etag, last_modified = self._validators(queryset, *parts)
+        if not count and 'detail' in parts:
+            # Let the handler answer the 404
+            return handler(request, *args, **kwargs)
+        # HTTP dates have one-second resolution, so a state from the current second could still
+        # change within it; such a state is only validated by its ETag
+        if last_modified >= int(time.time()):
+            last_modified = None
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.headers.setdefault('ETag', etag)
+            if last_modified is not None:
+                response.headers.setdefault('Last-Modified', http_date(last_modified))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional(request, super().list, queryset, ('list',), *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return super().retrieve(request, *args, **kwargs)
+        return self._conditional(request, super().retrieve, queryset, ('detail', kwargs[lookup_url_kwarg]), *args, **kwargs)
@@ -0,0 +1,85 @@
+# core/dashboard.py
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from .alerts import open_alerts
+from .models import InventoryItem, Order, Supplier
+
+DASHBOARD_CACHE_KEY = 'dashboard:snapshot'
+# Short TTL so counts changed through paths that skip signals still catch up quickly
+DASHBOARD_CACHE_TTL = 30
+
+# The dashboard only lists this many low-stock items; the KPI card has the full count
+LOW_STOCK_LIST_LIMIT = 50
+
+
+def _build_snapshot():
+    inventory = InventoryItem.objects.aggregate(
+        total=Count('id'),
+        in_stock=Count('id', filter=Q(status=InventoryItem.INSTOCK)),
+        low_stock=Count('id', filter=Q(status=InventoryItem.LOWSTOCK)),
+        out_of_stock=Count('id', filter=Q(status=InventoryItem.OUTOFSTOCK)),
+        unknown=Count('id', filter=Q(status=InventoryItem.UNKNOWN)),
+    )
+    orders = Order.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='PENDING')),
+    )
+    suppliers = Supplier.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status=True)),
+        inactive=Count('id', filter=Q(status=False)),
+    )
+
+    status_counts = {
+        InventoryItem.OUTOFSTOCK: inventory['out_of_stock'],
+        InventoryItem.LOWSTOCK: inventory['low_stock'],
+        InventoryItem.INSTOCK: inventory['in_stock'],
+        InventoryItem.UNKNOWN: inventory['unknown'],
+    }
+    status_map = InventoryItem.INV_STATUS_CHOICES
+    order_status_map = dict(Order.ORDER_STATUS)
+
+    recent_orders = list(
+        Order.objects.order_by('-date_ordered')
+        .values('id', 'order_number', 'status', supplier_name=F('supplier__name'))[:5]
+    )
+    for order in recent_orders:
+        order['status_display'] = order_status_map.get(order['status'], order['status'])
+
+    # Read from the open-alert table instead of scanning inventory by status
+    low_stock_items = open_alerts(limit=LOW_STOCK_LIST_LIMIT)
+
+    return {
+        'total_products': inventory['total'],
+        'low_stock': inventory['low_stock'],
+        'out_of_stock': inventory['out_of_stock'],
+        'stock_alerts': inventory['low_stock'] + inventory['out_of_stock'],
+        'total_orders': orders['total'],
+        'pending_orders': orders['pending'],
+        'total_suppliers': suppliers['total'],
+        'active_suppliers': suppliers['active'],
+        'inactive_suppliers': suppliers['inactive'],
+        # Statuses with no items are left out of the pie chart, ordered by status code
+        'inventory_chart_labels': [status_map[code] for code in sorted(status_counts) if status_counts[code]],
+        'inventory_chart_data': [status_counts[code] for code in sorted(status_counts) if status_counts[code]],
+        'recent_orders': recent_orders,
+        'recent_suppliers': list(Supplier.objects.order_by('-date_added').values('id', 'name')[:5]),
+        'top_suppliers': list(
+            Supplier.objects.annotate(order_count=Count('orders')).order_by('-order_count').values('id', 'name', 'order_count')[:5]
+        ),
+        'low_stock_items': low_stock_items,
+    }
+
+
+def get_dashboard_snapshot():
+    """Return the dashboard KPIs and lists, cached for DASHBOARD_CACHE_TTL seconds."""
+    snapshot = cache.get(DASHBOARD_CACHE_KEY)
+    if snapshot is None:
+        snapshot = _build_snapshot()
+        cache.set(DASHBOARD_CACHE_KEY, snapshot, DASHBOARD_CACHE_TTL)
+    return snapshot
+
+
+def invalidate_dashboard_snapshot():
+    cache.delete(DASHBOARD_CACHE_KEY)
@@ -2,10 +2,13 @@
 from functools import wraps
 from django.http import HttpResponseForbidden
 
+from .roles import get_effective_roles
+
 def allowed_roles(roles=[]):
     """
     Decorator that allows access to a view only if the user belongs to one of the allowed groups or has one of the allowed roles in their profile.
     Superusers and users with Admin role automatically bypass this check.
+    Roles are resolved once per session (see get_effective_roles), so the check itself runs no queries.
     """
     def decorator(view_func):
         @wraps(view_func)
@@ -13,23 +16,17 @@ def allowed_roles(roles=[]):
             # Allow access if the user is a superuser
             if request.user.is_superuser:
                 return view_func(request, *args, **kwargs)
-            
+
+            effective_roles = get_effective_roles(request)
+
             # Allow access if user has Admin role in their profile
-            if hasattr(request.user, 'profile') and request.user.profile.role == 'Admin':
-                # Make them a superuser to ensure full access
-                request.user.is_superuser = True
-                request.user.is_staff = True
-                request.user.save()
+            if 'Admin' in effective_roles:
                 return view_func(request, *args, **kwargs)
-                
-            # Check if the user belongs to any of the allowed groups
-            if request.user.groups.filter(name__in=roles).exists():
-                return view_func(request, *args, **kwargs)
-                
-            # Check if user's profile role is in the allowed roles
-            if hasattr(request.user, 'profile') and request.user.profile.role in roles:
+
+            # Check if the user belongs to any of the allowed groups or has an allowed profile role
+            if effective_roles.intersection(roles):
                 return view_func(request, *args, **kwargs)
-                
+
             # Deny access if the user doesn't meet any of the conditions
             return HttpResponseForbidden("You are not authorized to view this page.")
         return wrapper_func
@@ -0,0 +1,158 @@
+# core/events.py
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .models import InventoryItem, InventoryItemDeletion, InventoryVersion
+from .sync import SYNC_OVERLAP, encode_sync_token
+
+# A stream ends after this many seconds and the browser reconnects with Last-Event-ID, so a
+# long-lived connection never pins a server thread indefinitely
+STREAM_DURATION = 50
+# Changes committed in this process wake the streams at once; changes made by other processes
+# are picked up by checking the inventory version this often
+STREAM_POLL_INTERVAL = 15
+# Comment line sent on an idle stream so proxies keep the connection open
+STREAM_HEARTBEAT = 15
+# Browser reconnect delay, in milliseconds
+STREAM_RETRY_MS = 2000
+
+ALERT_STATUSES = (InventoryItem.LOWSTOCK, InventoryItem.OUTOFSTOCK)
+
+
+class InventoryBroadcaster:
+    """Wakes the inventory streams of this process when an inventory change commits."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.generation = 0
+
+    def publish(self):
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """Block until something is published after `generation` or `timeout` passes. Returns the current generation."""
+        with self._condition:
+            if self.generation == generation:
+                self._condition.wait(timeout)
+            return self.generation
+
+
+broadcaster = InventoryBroadcaster()
+
+# Each open stream holds a server thread, so only this many run per process at once
+_stream_slots = threading.BoundedSemaphore(settings.INVENTORY_STREAM_MAX_CLIENTS)
+
+
+def notify_inventory_changed():
+    """Once the current transaction commits, advance the inventory version and wake the inventory streams."""
+    transaction.on_commit(InventoryVersion.bump)
+    transaction.on_commit(broadcaster.publish)
+
+
+def acquire_stream_slot():
+    return _stream_slots.acquire(blocking=False)
+
+
+def _format_event(event_id, payload):
+    data = json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"id: {event_id}\nevent: inventory\ndata: {data}\n\n"
+
+
+def _changes_since(since, fields, sent):
+    """
+    Rows changed and ids deleted since `since`, re-reading SYNC_OVERLAP of history like delta
+    sync does. `sent` remembers what this stream already pushed inside that window so the
+    overlap doesn't repeat events. Returns (items, deleted ids, latest timestamp seen).
+    """
+    window = since - SYNC_OVERLAP
+    latest = since
+
+    items = []
+    for row in InventoryItem.objects.filter(date_modified__gte=window).order_by('date_modified', 'id').values(*fields, 'date_modified'):
+        modified = row.pop('date_modified')
+        latest = max(latest, modified)
+        if sent.get(('item', row['id'])) != modified:
+            sent[('item', row['id'])] = modified
+            items.append(row)
+
+    deleted = []
+    for pk, item_id, date_deleted in InventoryItemDeletion.objects.filter(date_deleted__gte=window).values_list('id', 'item_id', 'date_deleted'):
+        latest = max(latest, date_deleted)
+        if ('deletion', pk) not in sent:
+            sent[('deletion', pk)] = date_deleted
+            deleted.append(item_id)
+
+    # Forget rows that have left the overlap window
+    horizon = latest - SYNC_OVERLAP
+    for key in [key for key, moment in sent.items() if moment < horizon]:
+        del sent[key]
+    return items, deleted, latest
+
+
+def inventory_event_stream(since, fields, row_formatter=None):
+    """
+    Yield Server-Sent Events for inventory changes after `since`. Each event carries the changed
+    items, the deleted ids and the ids of changed items that are low or out of stock (alerts);
+    its id is a sync token, so a reconnect with Last-Event-ID resumes where the stream stopped.
+    """
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+    sent = {}
+    generation = broadcaster.generation
+    version = None
+    start = time.monotonic()
+    deadline = start + STREAM_DURATION
+    last_write = start
+    # Catch up once at the start, then only after a publish or when another process moved the version
+    next_poll = start
+    published = True
+    while time.monotonic() < deadline:
+        if published or time.monotonic() >= next_poll:
+            next_poll = time.monotonic() + STREAM_POLL_INTERVAL
+            # Read before the changes: a change committed in between moves it again and is re-read
+            current = InventoryVersion.current()
+            if published or current != version:
+                version = current
+                items, deleted, since = _changes_since(since, fields, sent)
+                if items or deleted:
+                    if row_formatter is not None:
+                        items = [row_formatter(row) for row in items]
+                    yield _format_event(encode_sync_token(since), {
+                        'items': items,
+                        'deleted': deleted,
+                        'alerts': [row['id'] for row in items if row.get('status') in ALERT_STATUSES],
+                    })
+                    last_write = time.monotonic()
+        if time.monotonic() - last_write >= STREAM_HEARTBEAT:
+            yield ": keepalive\n\n"
+            last_write = time.monotonic()
+
+        timeout = min(next_poll, last_write + STREAM_HEARTBEAT, deadline) - time.monotonic()
+        current_generation = broadcaster.wait(generation, max(timeout, 0))
+        published = current_generation != generation
+        generation = current_generation
+
+
+class InventoryStream:
+    """Streaming response body that frees its stream slot when the response is closed."""
+
+    def __init__(self, events):
+        self._events = events
+        self._released = False
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def close(self):
+        self._events.close()
+        if not self._released:
+            self._released = True
+            _stream_slots.release()
+
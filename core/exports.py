@@ -0,0 +1,113 @@
+# core/exports.py
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from .models import InventoryItem, InventoryItemChanges, Order, Supplier
+
+# Rows fetched per round trip from the (server-side, on Postgres) cursor
+EXPORT_CHUNK_SIZE = 2000
+# Lines joined into each piece of the response body
+EXPORT_LINES_PER_WRITE = 200
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def _inventory_rows():
+    status_map = InventoryItem.INV_STATUS_CHOICES
+    rows = InventoryItem.objects.order_by('id').values(
+        'id', 'name', 'quantity', 'threshold', 'status', 'date_added', 'date_modified',
+    )
+    return rows, 'date_modified', lambda row: {**row, 'status': status_map.get(row['status'], "Unknown")}
+
+
+def _order_rows():
+    # One row per order item; the LEFT JOIN keeps orders that have no items
+    rows = Order.objects.order_by('id', 'items__id').values(
+        'id', 'order_number', 'status', 'date_ordered', 'expected_delivery',
+        supplier_name=F('supplier__name'), product_name=F('items__product_name'), item_id=F('items__item_id'),
+        quantity=F('items__quantity'),
+    )
+    return rows, 'date_ordered', None
+
+
+def _supplier_rows():
+    rows = Supplier.objects.order_by('id').values(
+        'id', 'name', 'contact_person', 'contact_email', 'phone', 'address', 'status', 'date_added', 'date_modified',
+    )
+    return rows, 'date_added', None
+
+
+def _change_rows():
+    rows = InventoryItemChanges.objects.order_by('id').values(
+        'id', 'item_id', 'old_value', 'new_value', 'status', 'date_executed',
+        item_name=F('item__name'), executing_user_name=F('executing_user__username'),
+    )
+    return rows, 'date_executed', None
+
+
+# Dataset name -> function returning (values() queryset, date field for start/end, row formatter)
+EXPORT_DATASETS = {
+    'inventory': _inventory_rows,
+    'orders': _order_rows,
+    'suppliers': _supplier_rows,
+    'inventory_changes': _change_rows,
+}
+
+
+def export_queryset(dataset, start=None, end=None):
+    """
+    Return (rows, formatter) for a dataset, limited to rows whose date field falls between the
+    `start` and `end` dates (inclusive, either may be None).
+    """
+    rows, date_field, formatter = EXPORT_DATASETS[dataset]()
+    if start is not None:
+        rows = rows.filter(**{f'{date_field}__gte': timezone.make_aware(datetime.combine(start, time.min))})
+    if end is not None:
+        rows = rows.filter(**{f'{date_field}__lt': timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))})
+    return rows, formatter
+
+
+class _Echo:
+    """File-like object that hands back what csv.writer writes instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines, size):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def stream_rows(rows, output_format, formatter=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield an export as CSV (header line first) or JSON lines. Rows are read chunk_size at a time
+    and written out in blocks of lines, so memory use doesn't depend on the size of the table.
+    """
+    iterator = rows.iterator(chunk_size=chunk_size)
+    if formatter is not None:
+        iterator = map(formatter, iterator)
+
+    if output_format == 'jsonl':
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        yield from _batched((encoder.encode(row) + '\n' for row in iterator), EXPORT_LINES_PER_WRITE)
+        return
+
+    writer = csv.writer(_Echo())
+    columns = list(rows.query.values_select) + list(rows.query.annotation_select)
+    yield writer.writerow(columns)
+    yield from _batched((writer.writerow([row[column] for column in columns]) for row in iterator), EXPORT_LINES_PER_WRITE)
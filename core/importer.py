@@ -0,0 +1,205 @@
+# core/importer.py
+import codecs
+import csv
+from contextlib import nullcontext
+
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from .dashboard import invalidate_dashboard_snapshot
+from .events import notify_inventory_changed
+from .list_cache import bump_list_generation
+from .models import InventoryItem, InventoryItemChanges, StockAlert, StockMovement
+
+# Number of CSV rows resolved and written per round of queries
+IMPORT_CHUNK_SIZE = 1000
+
+# Possible header variations for each field, matched as substrings of the lowercased header
+NAME_VARIATIONS = ['name', 'product', 'item', 'product name', 'item name', 'productname', 'itemname', 'title', 'description']
+QUANTITY_VARIATIONS = ['quantity', 'qty', 'amount', 'stock', 'count', 'number', 'total', 'inventory']
+THRESHOLD_VARIATIONS = ['threshold', 'minimum', 'min', 'reorder', 'reorder point', 'minimum stock', 'min stock', 'reorder level']
+
+
+class ImportResult:
+    """Running totals for one import."""
+
+    def __init__(self, total_rows=0):
+        self.total_rows = total_rows
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors = []
+
+    @property
+    def imported(self):
+        return self.created + self.updated + self.unchanged
+
+    def message(self):
+        message = f'Successfully imported {self.imported} products.'
+        if self.errors:
+            message += f' {len(self.errors)} items were skipped.'
+        return message
+
+
+def read_import_file(uploaded_file):
+    """Read an uploaded CSV into a DataFrame, falling back to the csv module if pandas can't parse it."""
+    try:
+        df = pd.read_csv(uploaded_file)
+    except Exception:
+        uploaded_file.seek(0)
+        reader = csv.DictReader(codecs.iterdecode(uploaded_file, 'utf-8'))
+        data = list(reader)
+        if not data:
+            raise Exception("No data found in CSV")
+        df = pd.DataFrame(data)
+
+    # Lowercase the headers for easier matching and drop fully empty rows
+    df.columns = df.columns.astype(str).str.lower().str.strip()
+    return df.dropna(how='all')
+
+
+def map_columns(columns):
+    """Return the (name, quantity, threshold) columns, falling back to column position."""
+    name_col = quantity_col = threshold_col = None
+    for col in columns:
+        if not name_col and any(variation in col for variation in NAME_VARIATIONS):
+            name_col = col
+        elif not quantity_col and any(variation in col for variation in QUANTITY_VARIATIONS):
+            quantity_col = col
+        elif not threshold_col and any(variation in col for variation in THRESHOLD_VARIATIONS):
+            threshold_col = col
+
+    if not name_col and len(columns) >= 1:
+        name_col = columns[0]
+    if not quantity_col and len(columns) >= 2:
+        quantity_col = columns[1]
+    if not threshold_col and len(columns) >= 3:
+        threshold_col = columns[2]
+    return name_col, quantity_col, threshold_col
+
+
+def _to_count(series):
+    """Convert a column to non-negative numbers, returning NaN where a value can't be parsed."""
+    values = series.where(series.notna(), 0)
+    values = pd.to_numeric(values.astype(str).str.replace(',', '').str.strip(), errors='coerce')
+    return values.clip(lower=0)
+
+
+def clean_rows(df):
+    """
+    Normalise a DataFrame into a list of (row_number, name, quantity, threshold) tuples.
+
+    Rows without a name (or a repeated header row) are dropped. If either number is not valid
+    both are imported as 0, as the row-by-row importer did.
+    """
+    name_col, quantity_col, threshold_col = map_columns(list(df.columns))
+    if name_col is None:
+        return []
+
+    names = df[name_col].where(df[name_col].notna(), '').astype(str).str.strip()
+    quantities = _to_count(df[quantity_col]) if quantity_col else pd.Series(0, index=df.index)
+    thresholds = _to_count(df[threshold_col]) if threshold_col else pd.Series(0, index=df.index)
+    invalid = quantities.isna() | thresholds.isna()
+    quantities = quantities.where(~invalid, 0).astype(int)
+    thresholds = thresholds.where(~invalid, 0).astype(int)
+
+    rows = []
+    for position, (index, name, quantity, threshold) in enumerate(zip(df.index, names, quantities, thresholds)):
+        if not name or (position == 0 and name.lower() == name_col.lower()):
+            continue
+        rows.append((index + 1, name, int(quantity), int(threshold)))
+    return rows
+
+
+def _import_chunk(chunk, result, user, now):
+    # Later rows win when a name repeats inside the file
+    latest = {}
+    for row_number, name, quantity, threshold in chunk:
+        if name in latest:
+            result.unchanged += 1
+        latest[name] = (row_number, quantity, threshold)
+
+    existing = {}
+    duplicates = set()
+    for item in InventoryItem.objects.filter(name__in=list(latest)):
+        if item.name in existing:
+            duplicates.add(item.name)
+        existing[item.name] = item
+
+    to_create = []
+    to_update = []
+    changes = []
+    status_changes = []
+    for name, (row_number, quantity, threshold) in latest.items():
+        if name in duplicates:
+            result.errors.append(f"Row {row_number}: more than one inventory item is named {name}")
+            continue
+
+        item = existing.get(name)
+        if item is None:
+            item = InventoryItem(name=name, quantity=quantity, threshold=threshold)
+            item.status = item.calculate_inv_status()
+            to_create.append(item)
+            continue
+
+        if item.quantity == quantity and item.threshold == threshold:
+            result.unchanged += 1
+            continue
+
+        old_quantity = item.quantity
+        status_changes.append((item, item.status))
+        item.quantity = quantity
+        item.threshold = threshold
+        item.status = item.calculate_inv_status()
+        # bulk_update() skips auto_now, and delta sync relies on date_modified
+        item.date_modified = now
+        to_update.append(item)
+        if old_quantity != quantity:
+            changes.append(InventoryItemChanges(
+                item=item,
+                old_value=old_quantity,
+                new_value=quantity,
+                status=item.status,
+                executing_user=user,
+            ))
+
+    InventoryItem.objects.bulk_create(to_create)
+    InventoryItem.objects.bulk_update(to_update, ['quantity', 'threshold', 'status', 'date_modified'])
+    InventoryItemChanges.objects.bulk_create(changes)
+    StockMovement.record(
+        [(item.pk, item.quantity) for item in to_create]
+        + [(change.item_id, change.new_value - change.old_value) for change in changes],
+        StockMovement.IMPORT, user=user, moment=now,
+    )
+    StockAlert.record_status_changes(status_changes + [(item, None) for item in to_create])
+    result.created += len(to_create)
+    result.updated += len(to_update)
+
+
+def import_inventory_rows(rows, user=None, chunk_size=IMPORT_CHUNK_SIZE, progress=None, single_transaction=True):
+    """
+    Create or update inventory items by name from cleaned rows.
+
+    Each chunk costs one SELECT plus bulk INSERT/UPDATE statements, and quantity changes are
+    written to InventoryItemChanges in bulk. By default the whole import is one transaction;
+    with single_transaction=False each chunk commits on its own, so progress is visible to
+    other connections. `progress`, if given, is called with the result after every chunk.
+    """
+    result = ImportResult(total_rows=len(rows))
+    with transaction.atomic() if single_transaction else nullcontext():
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            with transaction.atomic():
+                # Stamped per chunk: chunks committed one by one over minutes must not carry a
+                # date_modified that delta-sync clients have already moved past
+                _import_chunk(chunk, result, user, timezone.now())
+            result.processed += len(chunk)
+            if progress is not None:
+                progress(result)
+    # bulk_create()/bulk_update() don't send the save signals that refresh the dashboard, lists and streams
+    invalidate_dashboard_snapshot()
+    bump_list_generation(InventoryItem)
+    notify_inventory_changed()
+    return result
@@ -0,0 +1,85 @@
+# core/jobs.py
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .importer import read_import_file, clean_rows, import_inventory_rows
+from .models import ImportJob
+
+# Keep at most this many per-row errors on a job
+MAX_JOB_ERRORS = 500
+
+# Created on first use so it is never inherited across gunicorn's fork (preload_app)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='import-job')
+        return _executor
+
+
+def enqueue_import_job(job):
+    """Run an import job on the in-process worker thread."""
+    _get_executor().submit(_run_in_thread, job.pk)
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        run_import_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def claim_import_job(job_id):
+    """Mark a pending job as running. Returns False if another worker already claimed it."""
+    return ImportJob.objects.filter(pk=job_id, status=ImportJob.PENDING).update(
+        status=ImportJob.RUNNING, date_started=timezone.now()
+    ) == 1
+
+
+def run_import_job(job_id):
+    """Process one pending import job, recording progress on the job row after every chunk."""
+    if not claim_import_job(job_id):
+        return
+    job = ImportJob.objects.select_related('created_by').get(pk=job_id)
+
+    def record_progress(result):
+        ImportJob.objects.filter(pk=job_id).update(
+            processed_rows=result.processed,
+            created_count=result.created,
+            updated_count=result.updated,
+        )
+
+    try:
+        df = read_import_file(io.BytesIO(bytes(job.data)))
+        if df.empty:
+            raise ValueError('The CSV file is empty. Please add some data.')
+        rows = clean_rows(df)
+        ImportJob.objects.filter(pk=job_id).update(total_rows=len(rows))
+        result = import_inventory_rows(rows, user=job.created_by, progress=record_progress, single_transaction=False)
+    except Exception as e:
+        ImportJob.objects.filter(pk=job_id).update(
+            status=ImportJob.FAILED,
+            message=f'Error processing file: {str(e)}'[:255],
+            date_finished=timezone.now(),
+        )
+        return
+
+    ImportJob.objects.filter(pk=job_id).update(
+        status=ImportJob.COMPLETED,
+        processed_rows=result.processed,
+        created_count=result.created,
+        updated_count=result.updated,
+        errors=result.errors[:MAX_JOB_ERRORS],
+        message=result.message(),
+        data=None,
+        date_finished=timezone.now(),
+    )
@@ -0,0 +1,66 @@
+# core/ledger.py
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from .models import InventoryItem, StockMovement, StockSnapshot
+
+# Movements are timestamped before their transaction commits, so a snapshot is only taken of a
+# moment at least this far in the past, when every movement up to it has been committed
+SNAPSHOT_SETTLE_TIME = timedelta(minutes=5)
+SNAPSHOT_BATCH_SIZE = 2000
+
+
+def stock_at(item_id, moment):
+    """
+    Stock of one item at a moment: its latest snapshot at or before the moment plus the deltas
+    recorded after that snapshot, up to and including the moment. Two indexed queries.
+    """
+    snapshot = (
+        StockSnapshot.objects.filter(item_id=item_id, taken_at__lte=moment)
+        .order_by('-taken_at').values_list('taken_at', 'quantity').first()
+    )
+    movements = StockMovement.objects.filter(item_id=item_id, date_created__lte=moment)
+    quantity = 0
+    if snapshot is not None:
+        taken_at, quantity = snapshot
+        movements = movements.filter(date_created__gt=taken_at)
+    return quantity + (movements.aggregate(total=Sum('delta'))['total'] or 0)
+
+
+def catalogue_stock_at(moment):
+    """
+    Stock of every item that existed at a moment, as {item id: quantity}: the latest catalogue
+    snapshot at or before the moment plus the deltas after it, summed per item in one query.
+    """
+    taken_at = StockSnapshot.objects.filter(taken_at__lte=moment).aggregate(latest=Max('taken_at'))['latest']
+    quantities = dict.fromkeys(InventoryItem.objects.filter(date_added__lte=moment).values_list('id', flat=True), 0)
+
+    movements = StockMovement.objects.filter(date_created__lte=moment)
+    if taken_at is not None:
+        quantities.update(StockSnapshot.objects.filter(taken_at=taken_at).values_list('item_id', 'quantity'))
+        movements = movements.filter(date_created__gt=taken_at)
+    for item_id, total in movements.values('item_id').annotate(total=Sum('delta')).order_by().values_list('item_id', 'total'):
+        quantities[item_id] = quantities.get(item_id, 0) + total
+    return quantities
+
+
+def take_snapshot(moment):
+    """
+    Store the stock of every item at `moment`, computed from the ledger so a snapshot always
+    agrees with the movements around it. Returns the number of rows written, or None if a
+    snapshot already exists for that moment.
+    """
+    if moment > timezone.now() - SNAPSHOT_SETTLE_TIME:
+        raise ValueError(f'Snapshots can only be taken of moments at least {SNAPSHOT_SETTLE_TIME} ago.')
+    with transaction.atomic():
+        if StockSnapshot.objects.filter(taken_at=moment).exists():
+            return None
+        quantities = catalogue_stock_at(moment)
+        StockSnapshot.objects.bulk_create(
+            [StockSnapshot(item_id=item_id, taken_at=moment, quantity=quantity) for item_id, quantity in quantities.items()],
+            batch_size=SNAPSHOT_BATCH_SIZE,
+        )
+    return len(quantities)
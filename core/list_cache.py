@@ -0,0 +1,86 @@
+# core/list_cache.py
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from .roles import get_effective_roles, resolve_roles
+
+
+def _generation_key(model):
+    return f'listcache:generation:{model._meta.label_lower}'
+
+
+def bump_list_generation(*models):
+    """
+    Retire every cached list built from these models. Runs when the current transaction commits,
+    so a list read before the commit can't be stored under the new generation.
+    """
+    def bump():
+        # A fresh random token rather than a counter: a generation evicted from the cache can't
+        # come back as a value that old entries were stored under
+        cache.set_many({_generation_key(model): uuid.uuid4().hex for model in models}, None)
+    transaction.on_commit(bump)
+
+
+def _generations(models):
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in generations}
+    if missing:
+        # add() keeps a generation another thread set in the meantime
+        for key, value in missing.items():
+            if not cache.add(key, value, None):
+                value = cache.get(key, value)
+            generations[key] = value
+    return [generations[key] for key in keys]
+
+
+def _role_key(request):
+    user = request.user
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'superuser'
+    # Token clients have no session to keep resolved roles in
+    roles = get_effective_roles(request) if request.session.session_key else resolve_roles(user)
+    return ','.join(sorted(roles))
+
+
+def list_cache_key(request, name, models):
+    """Cache key of a list response: the list, the generations of its models, the role and the query string."""
+    params = sorted((key, value) for key in request.GET for value in request.GET.getlist(key))
+    digest = hashlib.sha256(repr((_role_key(request), params)).encode('utf-8')).hexdigest()
+    return f"listcache:{name}:{':'.join(_generations(models))}:{digest}"
+
+
+def cached_list(request, name, models, build):
+    """Return build() for this request, from the cache while none of the models has changed."""
+    key = list_cache_key(request, name, models)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.LIST_CACHE_TTL)
+    return data
+
+
+class CachedListMixin:
+    """
+    Caches the serialized output of a viewset's list action per query string and role. Set
+    `list_cache_models` to every model the list is built from; their generations are bumped by
+    the save/delete signals and by the bulk write paths.
+    """
+    list_cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(request, self.basename, self.list_cache_models or (self.queryset.model,))
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.LIST_CACHE_TTL)
+        return response
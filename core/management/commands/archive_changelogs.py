@@ -0,0 +1,22 @@
+# core/management/commands/archive_changelogs.py
+from django.core.management.base import BaseCommand
+
+from core.archive import ARCHIVE_BATCH_SIZE, ARCHIVE_SOURCES, archive_history, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Moves change history older than the retention period (CHANGELOG_RETENTION_DAYS) into compressed monthly archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Archive rows older than this many days (default: CHANGELOG_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='Rows moved per transaction')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to wait between batches to ease load on the database')
+        parser.add_argument('--source', choices=sorted(ARCHIVE_SOURCES), action='append', help='Only archive this history table (repeatable)')
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['days'])
+        for source in options['source'] or sorted(ARCHIVE_SOURCES):
+            total = archive_history(source, cutoff, options['batch_size'], options['pause'])
+            self.stdout.write(f'{source}: archived {total} rows executed before {cutoff:%Y-%m-%d %H:%M}')
+
+        self.stdout.write(self.style.SUCCESS('Change history archived.'))
@@ -0,0 +1,126 @@
+# core/management/commands/benchmark.py
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from core.sync import encode_sync_token
+
+User = get_user_model()
+
+
+def benchmark_targets():
+    """(name, path) of the views and APIs worth timing, in report order."""
+    recent = encode_sync_token(timezone.now())
+    return [
+        ('dashboard', '/'),
+        ('api_dashboard', '/api/dashboard/'),
+        ('orders_page', '/orders.html'),
+        ('orders_page_filtered', '/orders.html?status=PENDING&sort=-supplier&page=2'),
+        ('inventory_full', '/inventory/items/'),
+        ('inventory_page', '/inventory/items/?limit=100'),
+        ('inventory_search', '/inventory/items/?limit=100&q=product+00'),
+        ('inventory_delta', f'/inventory/items/?since={recent}'),
+        ('inventory_alerts', '/inventory/alerts/'),
+        ('changelog_api', '/api/v1/changelog/?limit=100'),
+        ('suppliers_api', '/api/v1/suppliers/'),
+        ('orders_api', '/api/v1/orders/'),
+    ]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Times the key views and APIs in-process and reports latency percentiles and query counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to request as (default: the first superuser or Admin)')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per target')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per target before timing')
+        parser.add_argument('--only', action='append', help='Only run this target (repeatable)')
+        parser.add_argument('--path', action='append', default=[], help='Extra path to time (repeatable)')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every request')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(Q(is_superuser=True) | Q(profile__role='Admin')).order_by('pk').first()
+        if user is None:
+            raise CommandError('No user to request as; pass --user or create a superuser.')
+
+        client = Client()
+        client.force_login(user)
+
+        targets = benchmark_targets() + [(path, path) for path in options['path']]
+        if options['only']:
+            targets = [(name, path) for name, path in targets if name in options['only']]
+            if not targets:
+                raise CommandError('No targets match --only.')
+
+        # The test client's host isn't in ALLOWED_HOSTS outside of tests
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            results = [self.run_target(client, name, path, options) for name, path in targets]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'target':<24}{'status':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'queries':>9}{'KB':>9}")
+        for result in results:
+            if 'error' in result:
+                self.stdout.write(f"{result['name']:<24}  error: {result['error']}")
+                continue
+            self.stdout.write(
+                f"{result['name']:<24}{result['status']:>7}{result['p50_ms']:>9.1f}{result['p90_ms']:>9.1f}"
+                f"{result['p99_ms']:>9.1f}{result['max_ms']:>9.1f}{result['queries']:>9}{result['kb']:>9.1f}"
+            )
+
+    def request(self, client, path, cold):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(path)
+            # Streaming responses are only produced when consumed
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            elapsed = (time.perf_counter() - start) * 1000
+        return response.status_code, elapsed, len(queries.captured_queries), len(body)
+
+    def run_target(self, client, name, path, options):
+        try:
+            for _ in range(options['warmup']):
+                self.request(client, path, options['cold'])
+            samples = [self.request(client, path, options['cold']) for _ in range(max(1, options['iterations']))]
+        except Exception as e:
+            return {'name': name, 'path': path, 'error': f'{type(e).__name__}: {e}'}
+
+        timings = [elapsed for _, elapsed, _, _ in samples]
+        query_counts = [count for _, _, count, _ in samples]
+        return {
+            'name': name,
+            'path': path,
+            'status': samples[-1][0],
+            'p50_ms': statistics.median(timings),
+            'p90_ms': percentile(timings, 0.90),
+            'p99_ms': percentile(timings, 0.99),
+            'max_ms': max(timings),
+            'mean_ms': statistics.fmean(timings),
+            # The most queries seen, so a path that sometimes misses a cache shows its real cost
+            'queries': max(query_counts),
+            'kb': samples[-1][3] / 1024,
+        }
@@ -0,0 +1,107 @@
+# core/management/commands/benchmark_serializers.py
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.models import InventoryItem, InventoryItemChanges, Order, Supplier
+from core.renderers import FastJSONRenderer
+from core.serializers import (
+    InventoryItemChangesListSerializer, InventoryItemChangesSerializer, InventoryItemListSerializer,
+    InventoryItemSerializer, OrderListSerializer, OrderSerializer, SupplierListSerializer, SupplierSerializer,
+)
+
+
+def datasets():
+    """(name, queryset, ModelSerializer, ValuesListSerializer) for each list API."""
+    return [
+        ('items', InventoryItem.objects.order_by('id'), InventoryItemSerializer, InventoryItemListSerializer),
+        ('suppliers', Supplier.objects.order_by('id'), SupplierSerializer, SupplierListSerializer),
+        ('orders', Order.objects.order_by('id'), OrderSerializer, OrderListSerializer),
+        ('changes', InventoryItemChanges.objects.select_related('item', 'executing_user').order_by('id'),
+         InventoryItemChangesSerializer, InventoryItemChangesListSerializer),
+    ]
+
+
+class Command(BaseCommand):
+    help = ('Times serializing and rendering large lists with the ModelSerializers and JSONRenderer '
+            'against the values() list serializers and FastJSONRenderer')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows per list')
+        parser.add_argument('--iterations', type=int, default=3, help='Runs per measurement; the fastest is reported')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        # Tables with fewer rows are topped up with synthetic ones, which are rolled back afterwards
+        with transaction.atomic():
+            self.fill(rows)
+            results = [self.measure(name, queryset[:rows], full, fast, options['iterations'])
+                       for name, queryset, full, fast in datasets()]
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'list':<12}{'rows':>8}{'drf ms':>10}{'fast ms':>10}{'speedup':>9}")
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<12}{result['rows']:>8}{result['drf_ms']:>10.1f}{result['fast_ms']:>10.1f}{result['speedup']:>8.1f}x"
+            )
+
+    def fill(self, rows):
+        supplier_gap = rows - Supplier.objects.count()
+        if supplier_gap > 0:
+            Supplier.objects.bulk_create([
+                Supplier(name=f'Benchmark Supplier {n}', contact_person='Benchmark', contact_email=f'bench{n}@example.com',
+                         phone='555-0000', address='1 Benchmark Road')
+                for n in range(supplier_gap)
+            ], batch_size=2000)
+        item_gap = rows - InventoryItem.objects.count()
+        if item_gap > 0:
+            InventoryItem.objects.bulk_create(
+                [InventoryItem(name=f'Benchmark Item {n}', quantity=n % 100, threshold=10) for n in range(item_gap)],
+                batch_size=2000,
+            )
+        supplier = Supplier.objects.order_by('id').first()
+        order_gap = rows - Order.objects.count()
+        if order_gap > 0:
+            Order.objects.bulk_create(
+                [Order(order_number=f'BENCH-{n:07d}', supplier=supplier, expected_delivery=timezone.now().date()) for n in range(order_gap)],
+                batch_size=2000,
+            )
+        item = InventoryItem.objects.order_by('id').first()
+        change_gap = rows - InventoryItemChanges.objects.count()
+        if change_gap > 0:
+            InventoryItemChanges.objects.bulk_create(
+                [InventoryItemChanges(item=item, old_value=n, new_value=n + 1, status=InventoryItem.INSTOCK) for n in range(change_gap)],
+                batch_size=2000,
+            )
+
+    def timed(self, function, iterations):
+        best, result = None, None
+        for _ in range(max(1, iterations)):
+            start = time.perf_counter()
+            result = function()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def measure(self, name, queryset, full, fast, iterations):
+        # Both include the query, so instance creation is part of what the ModelSerializer costs
+        drf_ms, drf_body = self.timed(lambda: JSONRenderer().render(full(queryset.all(), many=True).data), iterations)
+        fast_ms, fast_body = self.timed(lambda: FastJSONRenderer().render(fast().rows(queryset.all())), iterations)
+        if json.loads(drf_body) != json.loads(fast_body):
+            self.stderr.write(f'{name}: the two serializers returned different data')
+        return {
+            'name': name,
+            'rows': len(json.loads(fast_body)),
+            'drf_ms': drf_ms,
+            'fast_ms': fast_ms,
+            'speedup': drf_ms / fast_ms if fast_ms else 0.0,
+        }
@@ -0,0 +1,226 @@
+# core/management/commands/generate_data.py
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.dashboard import invalidate_dashboard_snapshot
+from core.events import notify_inventory_changed
+from core.list_cache import bump_list_generation
+from core.models import (
+    Changelog, InventoryItem, InventoryItemChanges, Order, OrderItem, Profile, PurchaseOrder,
+    PurchaseOrderItem, StockAlert, StockMovement, Supplier,
+)
+from core.orders import allocate_order_numbers
+
+User = get_user_model()
+
+ROLES = ['Owner', 'Manager', 'Employee']
+ORDER_STATUSES = ['PENDING', 'COMPLETED', 'COMPLETED', 'COMPLETED', 'CANCELLED']
+
+
+class Command(BaseCommand):
+    help = 'Fills the database with a reproducible, production-sized synthetic dataset using bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed and counts give the same data')
+        parser.add_argument('--prefix', default='SYN', help='Prefix for generated names, so several datasets can coexist')
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--suppliers', type=int, default=200)
+        parser.add_argument('--items', type=int, default=20000, help='Inventory items')
+        parser.add_argument('--orders', type=int, default=50000)
+        parser.add_argument('--max-order-items', type=int, default=5, help='Each order gets 1 to this many items')
+        parser.add_argument('--purchase-orders', type=int, default=5000)
+        parser.add_argument('--changes', type=int, default=200000, help='Inventory change log rows')
+        parser.add_argument('--changelog', type=int, default=20000, help='Supplier change log rows')
+        parser.add_argument('--days', type=int, default=730, help='Spread dates over this many past days')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.tag = f"{options['prefix']}{options['seed']}"
+        self.batch_size = options['batch_size']
+        self.days = options['days']
+        self.now = timezone.now()
+
+        if (options['orders'] or options['purchase_orders']) and not (options['suppliers'] and options['items']):
+            raise CommandError('Orders and purchase orders need at least one supplier and one item.')
+        if options['changes'] and not options['items']:
+            raise CommandError('Inventory changes need at least one item.')
+        if options['changelog'] and not options['suppliers']:
+            raise CommandError('Supplier changelog rows need at least one supplier.')
+        if Supplier.objects.filter(name__startswith=f'{self.tag} ').exists():
+            raise CommandError(f'Data tagged {self.tag} already exists; use another --seed or --prefix.')
+
+        with transaction.atomic():
+            users = self.create_users(options['users'])
+            suppliers = self.create_suppliers(options['suppliers'])
+            items = self.create_items(options['items'])
+            self.create_orders(options['orders'], options['max_order_items'], suppliers, items)
+            self.create_purchase_orders(options['purchase_orders'], options['max_order_items'], suppliers, items)
+            self.create_changes(options['changes'], items, users)
+            self.create_changelog(options['changelog'], suppliers, users)
+
+        invalidate_dashboard_snapshot()
+        bump_list_generation(InventoryItem, Order, Supplier)
+        notify_inventory_changed()
+        self.stdout.write(self.style.SUCCESS(f'Synthetic dataset {self.tag} generated.'))
+
+    def report(self, label, count):
+        self.stdout.write(f'{label}: {count}')
+
+    def spread_dates(self, model, field, pks):
+        """Move auto_now_add timestamps into the past, with one UPDATE per day."""
+        by_day = {}
+        for pk in pks:
+            by_day.setdefault(self.rng.randrange(self.days), []).append(pk)
+        for day, day_pks in by_day.items():
+            moment = self.now - timedelta(days=day, seconds=self.rng.randrange(86400))
+            for start in range(0, len(day_pks), self.batch_size):
+                model.objects.filter(pk__in=day_pks[start:start + self.batch_size]).update(**{field: moment})
+
+    def create_users(self, count):
+        password = make_password('password123')
+        users = User.objects.bulk_create(
+            [User(username=f'{self.tag.lower()}_user{n}', email=f'{self.tag.lower()}_user{n}@example.com', password=password) for n in range(count)],
+            batch_size=self.batch_size,
+        )
+        # bulk_create() skips the signal that creates profiles
+        Profile.objects.bulk_create(
+            [Profile(user=user, role=ROLES[n % len(ROLES)]) for n, user in enumerate(users)],
+            batch_size=self.batch_size,
+        )
+        self.report('Users', len(users))
+        return users
+
+    def create_suppliers(self, count):
+        suppliers = Supplier.objects.bulk_create([
+            Supplier(
+                name=f'{self.tag} Supplier {n:05d}',
+                contact_person=f'Contact {n}',
+                contact_email=f'supplier{n}@{self.tag.lower()}.example.com',
+                phone=f'555-{self.rng.randrange(10000):04d}',
+                address=f'{self.rng.randrange(1, 9999)} Market Street',
+                status=self.rng.random() < 0.85,
+            )
+            for n in range(count)
+        ], batch_size=self.batch_size)
+        self.spread_dates(Supplier, 'date_added', [supplier.pk for supplier in suppliers])
+        self.report('Suppliers', len(suppliers))
+        return suppliers
+
+    def create_items(self, count):
+        items = []
+        for n in range(count):
+            threshold = self.rng.choice([0, 5, 10, 20, 50])
+            # Skewed so a realistic share of items is low or out of stock
+            quantity = 0 if self.rng.random() < 0.05 else int(self.rng.expovariate(1 / 60))
+            item = InventoryItem(name=f'{self.tag} Product {n:06d}', quantity=quantity, threshold=threshold)
+            item.status = item.calculate_inv_status()
+            items.append(item)
+        items = InventoryItem.objects.bulk_create(items, batch_size=self.batch_size)
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            StockAlert.record_status_changes([(item, None) for item in batch])
+            StockMovement.record([(item.pk, item.quantity) for item in batch], StockMovement.OPENING, moment=self.now)
+        self.report('Inventory items', len(items))
+        return items
+
+    def create_orders(self, count, max_items, suppliers, items):
+        if not count:
+            return
+        numbers = allocate_order_numbers(count)
+        orders = Order.objects.bulk_create([
+            Order(
+                order_number=number,
+                supplier=self.rng.choice(suppliers),
+                status=self.rng.choice(ORDER_STATUSES),
+                expected_delivery=(self.now + timedelta(days=self.rng.randrange(-60, 60))).date(),
+            )
+            for number in numbers
+        ], batch_size=self.batch_size)
+        self.spread_dates(Order, 'date_ordered', [order.pk for order in orders])
+
+        order_items = 0
+        batch = []
+        for order in orders:
+            for item in self.rng.sample(items, min(len(items), self.rng.randint(1, max_items))):
+                batch.append(OrderItem(order=order, item=item, product_name=item.name, quantity=self.rng.randint(1, 100)))
+            if len(batch) >= self.batch_size:
+                OrderItem.objects.bulk_create(batch)
+                order_items += len(batch)
+                batch = []
+        OrderItem.objects.bulk_create(batch)
+        order_items += len(batch)
+        self.report('Orders', len(orders))
+        self.report('Order items', order_items)
+
+    def create_purchase_orders(self, count, max_items, suppliers, items):
+        purchase_orders = PurchaseOrder.objects.bulk_create([
+            PurchaseOrder(
+                order_number=f'{self.tag}-PO-{n:07d}',
+                supplier=self.rng.choice(suppliers),
+                received=self.rng.random() < 0.7,
+            )
+            for n in range(count)
+        ], batch_size=self.batch_size)
+        self.spread_dates(PurchaseOrder, 'date', [purchase_order.pk for purchase_order in purchase_orders])
+
+        po_items = []
+        for purchase_order in purchase_orders:
+            total = Decimal('0.00')
+            for item in self.rng.sample(items, min(len(items), self.rng.randint(1, max_items))):
+                price = Decimal(self.rng.randrange(100, 50000)) / 100
+                quantity = self.rng.randint(1, 200)
+                total += price * quantity
+                po_items.append(PurchaseOrderItem(purchase_order=purchase_order, item=item, quantity=quantity, price=price))
+            purchase_order.total_cost = min(total, Decimal('99999999.99'))
+        PurchaseOrderItem.objects.bulk_create(po_items, batch_size=self.batch_size)
+        PurchaseOrder.objects.bulk_update(purchase_orders, ['total_cost'], batch_size=self.batch_size)
+        self.report('Purchase orders', len(purchase_orders))
+        self.report('Purchase order items', len(po_items))
+
+    def create_changes(self, count, items, users):
+        pks = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - start)):
+                item = self.rng.choice(items)
+                old_value = self.rng.randrange(500)
+                new_value = max(0, old_value + self.rng.randint(-50, 50))
+                batch.append(InventoryItemChanges(
+                    item=item,
+                    old_value=old_value,
+                    new_value=new_value,
+                    status=self.rng.choice(list(InventoryItem.INV_STATUS_CHOICES)),
+                    executing_user=self.rng.choice(users) if users and self.rng.random() < 0.9 else None,
+                ))
+            pks.extend(change.pk for change in InventoryItemChanges.objects.bulk_create(batch))
+        self.spread_dates(InventoryItemChanges, 'date_executed', pks)
+        self.report('Inventory changes', len(pks))
+
+    def create_changelog(self, count, suppliers, users):
+        fields = ['phone', 'address', 'contact_person', 'status']
+        pks = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - start)):
+                field_name = self.rng.choice(fields)
+                old_value, new_value = f'old {self.rng.randrange(1000)}', f'new {self.rng.randrange(1000)}'
+                batch.append(Changelog(
+                    model_name='Supplier',
+                    record_id=self.rng.choice(suppliers).pk,
+                    field_name=field_name,
+                    old_value=old_value,
+                    new_value=new_value,
+                    changes={field_name: [old_value, new_value]},
+                    executing_user=self.rng.choice(users) if users else None,
+                ))
+            pks.extend(entry.pk for entry in Changelog.objects.bulk_create(batch))
+        self.spread_dates(Changelog, 'date_executed', pks)
+        self.report('Supplier changelog', len(pks))
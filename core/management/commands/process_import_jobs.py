@@ -0,0 +1,29 @@
+# core/management/commands/process_import_jobs.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_import_job
+from core.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Processes pending CSV product import jobs (for running imports outside the web process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new jobs instead of exiting when the queue is empty')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to wait between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            pending = list(ImportJob.objects.filter(status=ImportJob.PENDING).order_by('date_added').values_list('id', flat=True))
+            for job_id in pending:
+                run_import_job(job_id)
+                job = ImportJob.objects.get(pk=job_id)
+                self.stdout.write(f'Import job {job.id} ({job.file_name}): {job.status} {job.message}')
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Import queue processed.'))
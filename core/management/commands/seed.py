@@ -9,15 +9,15 @@ class Command(BaseCommand):
     help = 'Seeds the database with initial data'
 
     def handle(self, *args, **options):
-        # Optional: Delete existing profiles and users for seeding purposes
-        Profile.objects.all().delete()
+        # Optional: Delete the sample users (and their profiles) for seeding purposes
         User.objects.filter(username__in=['alice', 'bob', 'charlie']).delete()
         self.stdout.write('Deleted old profiles and users.')
 
-      Sample data – adjust these keys to match your Profile model
-    sample_data = [
-         {'username': 'alice', 'email': 'alice@example.com', 'bio': 'Hello, I am Alice!'},
-           {'username': 'charlie', 'email': 'charlie@example.com', 'bio': 'Hey, I am Charlie.'},
+        # Sample data – adjust these keys to match your Profile model
+        sample_data = [
+            {'username': 'alice', 'email': 'alice@example.com', 'bio': 'Hello, I am Alice!'},
+            {'username': 'bob', 'email': 'bob@example.com', 'bio': 'Hi, I am Bob.'},
+            {'username': 'charlie', 'email': 'charlie@example.com', 'bio': 'Hey, I am Charlie.'},
         ]
 
         for data in sample_data:
@@ -27,11 +27,10 @@ class Command(BaseCommand):
                 email=data['email'],
                 password='password123'
             )
-            # Create the profile using the 'user' field and the 'bio'
-            profile = Profile.objects.create(
-                user=user,
-                bio=data['bio']
-            )
+            # The profile is created by the post_save signal; fill in the 'bio'
+            profile, _ = Profile.objects.get_or_create(user=user)
+            profile.bio = data['bio']
+            profile.save()
             self.stdout.write(f'Created profile for user: {user.username}')
 
         self.stdout.write(self.style.SUCCESS('Database seeded successfully!'))
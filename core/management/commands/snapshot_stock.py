@@ -0,0 +1,36 @@
+# core/management/commands/snapshot_stock.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.ledger import take_snapshot
+
+
+class Command(BaseCommand):
+    help = ('Stores every item\'s stock at the start of the current day or month, so point-in-time stock '
+            'queries only sum the movements recorded since; meant to run from a scheduler')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', choices=['day', 'month'], default='month', help='Snapshot the start of the current day or month')
+        parser.add_argument('--at', help='Snapshot this ISO 8601 moment instead')
+
+    def handle(self, *args, **options):
+        if options['at']:
+            moment = parse_datetime(options['at'])
+            if moment is None:
+                raise CommandError(f"Invalid --at value {options['at']}; expected an ISO 8601 date and time.")
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+        else:
+            moment = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+            if options['period'] == 'month':
+                moment = moment.replace(day=1)
+
+        try:
+            written = take_snapshot(moment)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if written is None:
+            self.stdout.write(f'A snapshot of {moment.isoformat()} already exists.')
+            return
+        self.stdout.write(self.style.SUCCESS(f'Stock of {written} items stored as of {moment.isoformat()}.'))
@@ -0,0 +1,155 @@
+# core/metrics.py
+import threading
+import time
+
+from django.db import connection
+
+# Upper bounds of the histogram buckets (+Inf is implied)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# View label for requests that didn't resolve to a view (404s, static files)
+UNMATCHED_VIEW = '<unmatched>'
+# Anything else is counted as OTHER so clients can't create unbounded label values
+KNOWN_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _ViewStats:
+    __slots__ = ('latency', 'queries', 'db_seconds')
+
+    def __init__(self):
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.queries = _Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = 0.0
+
+
+class MetricsRegistry:
+    """Request metrics for this worker process, shared by all of its threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, view, method, status, seconds, queries, db_seconds):
+        key = (view, method, str(status))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _ViewStats()
+            stats.latency.observe(seconds)
+            stats.queries.observe(queries)
+            stats.db_seconds += db_seconds
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = [
+                (key, list(stats.latency.counts), stats.latency.sum, stats.latency.count,
+                 list(stats.queries.counts), stats.queries.sum, stats.db_seconds)
+                for key, stats in sorted(self._stats.items())
+            ]
+
+        latency_lines, query_lines, db_lines = [], [], []
+        for (view, method, status), latency_counts, latency_sum, count, query_counts, query_sum, db_seconds in snapshot:
+            labels = f'view="{_escape(view)}",method="{_escape(method)}",status="{status}"'
+            latency_lines.extend(_histogram_lines('ecims_request_duration_seconds', labels, LATENCY_BUCKETS, latency_counts, latency_sum, count))
+            query_lines.extend(_histogram_lines('ecims_request_db_queries', labels, QUERY_COUNT_BUCKETS, query_counts, query_sum, count))
+            db_lines.append(f'ecims_request_db_seconds_total{{{labels}}} {_number(db_seconds)}')
+
+        lines = [
+            '# HELP ecims_request_duration_seconds Time spent producing the response, per view.',
+            '# TYPE ecims_request_duration_seconds histogram',
+            *latency_lines,
+            '# HELP ecims_request_db_queries Database queries run per request, per view.',
+            '# TYPE ecims_request_db_queries histogram',
+            *query_lines,
+            '# HELP ecims_request_db_seconds_total Time spent in database queries, per view.',
+            '# TYPE ecims_request_db_seconds_total counter',
+            *db_lines,
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name, labels, buckets, counts, total, count):
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        yield f'{name}_bucket{{{labels},le="{_number(float(bound))}"}} {cumulative}'
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {count}'
+    yield f'{name}_sum{{{labels}}} {_number(total)}'
+    yield f'{name}_count{{{labels}}} {count}'
+
+
+registry = MetricsRegistry()
+
+
+class _QueryTimer:
+    """Database execute wrapper counting the queries and query time of one request."""
+    __slots__ = ('queries', 'seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, query count and query time for every request, labelled with the URL name
+    of the view it resolved to. Streaming responses are timed until the view returns.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNMATCHED_VIEW
+        method = request.method if request.method in KNOWN_METHODS else 'OTHER'
+        registry.record(view, method, response.status_code, elapsed, timer.queries, timer.seconds)
+        return response
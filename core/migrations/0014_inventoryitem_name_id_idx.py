@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_merge_20250416_1500'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='inventoryitemchanges',
+            options={'ordering': ['-date_executed']},
+        ),
+        migrations.AddIndex(
+            model_name='inventoryitem',
+            index=models.Index(fields=['name', 'id'], name='inventoryitem_name_id_idx'),
+        ),
+    ]
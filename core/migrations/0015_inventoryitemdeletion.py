@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_inventoryitem_name_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryItemDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_id', models.BigIntegerField()),
+                ('date_deleted', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='inventoryitem',
+            index=models.Index(fields=['date_modified'], name='inventoryitem_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:08
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelog',
+            name='changes',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_order_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventoryitemchanges',
+            index=models.Index(fields=['date_executed', 'id'], name='itemchanges_executed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventoryitemchanges',
+            index=models.Index(fields=['item', 'date_executed'], name='itemchanges_item_executed_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_inventoryitemchanges_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('inventory_changes', 'Inventory item changes'), ('changelog', 'Changelog')], max_length=30)),
+                ('period', models.DateField()),
+                ('first_executed', models.DateTimeField()),
+                ('last_executed', models.DateTimeField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('date_archived', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['date_executed', 'id'], name='changelog_executed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='changearchive',
+            index=models.Index(fields=['source', 'period'], name='changearchive_period_idx'),
+        ),
+    ]
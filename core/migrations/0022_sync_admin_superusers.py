@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def promote_admin_profiles(apps, schema_editor):
+    # allowed_roles used to promote Admin-role users to superuser on their next request;
+    # it no longer writes, so bring existing Admin users up to date once here.
+    User = apps.get_model('auth', 'User')
+    User.objects.filter(profile__role='Admin').exclude(is_superuser=True, is_staff=True).update(is_superuser=True, is_staff=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_changearchive'),
+    ]
+
+    operations = [
+        migrations.RunPython(promote_admin_profiles, migrations.RunPython.noop),
+    ]
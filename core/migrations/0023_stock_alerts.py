@@ -0,0 +1,70 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def open_existing_alerts(apps, schema_editor):
+    # Items already low or out of stock get an open alert, as if they had just crossed the threshold
+    InventoryItem = apps.get_model('core', 'InventoryItem')
+    StockAlert = apps.get_model('core', 'StockAlert')
+    StockAlert.objects.bulk_create(
+        [StockAlert(item_id=pk, status=status) for pk, status in InventoryItem.objects.filter(status__in=(1, 2)).values_list('pk', 'status').iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_sync_admin_superusers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.IntegerField(choices=[(3, 'In Stock'), (2, 'Low Stock'), (1, 'Out of Stock'), (0, 'Unknown')])),
+                ('date_opened', models.DateTimeField(auto_now_add=True)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stock_alert', to='core.inventoryitem')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockAlertAcknowledgement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_acknowledged', models.DateTimeField(auto_now_add=True)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='acknowledgements', to='core.stockalert')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_alert_acknowledgements', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockAlertEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_status', models.IntegerField(choices=[(3, 'In Stock'), (2, 'Low Stock'), (1, 'Out of Stock'), (0, 'Unknown')], null=True)),
+                ('new_status', models.IntegerField(choices=[(3, 'In Stock'), (2, 'Low Stock'), (1, 'Out of Stock'), (0, 'Unknown')])),
+                ('quantity', models.IntegerField()),
+                ('threshold', models.IntegerField()),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_events', to='core.inventoryitem')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='stockalert',
+            index=models.Index(fields=['status', 'date_opened'], name='stockalert_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockalertacknowledgement',
+            constraint=models.UniqueConstraint(fields=('alert', 'user'), name='unique_stock_alert_acknowledgement'),
+        ),
+        migrations.AddIndex(
+            model_name='stockalertevent',
+            index=models.Index(fields=['item', 'date_created'], name='stockalertevent_item_idx'),
+        ),
+        migrations.RunPython(open_existing_alerts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# The statements are spelled out here so this migration keeps doing the same thing whatever
+# later happens to core/search.py
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_inventoryitem_fts USING fts5("
+    "name, content='core_inventoryitem', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS core_inventoryitem_fts_ai AFTER INSERT ON core_inventoryitem BEGIN "
+    "INSERT INTO core_inventoryitem_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS core_inventoryitem_fts_ad AFTER DELETE ON core_inventoryitem BEGIN "
+    "INSERT INTO core_inventoryitem_fts(core_inventoryitem_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS core_inventoryitem_fts_au AFTER UPDATE OF name ON core_inventoryitem BEGIN "
+    "INSERT INTO core_inventoryitem_fts(core_inventoryitem_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO core_inventoryitem_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO core_inventoryitem_fts(core_inventoryitem_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS core_inventoryitem_fts_ai",
+    "DROP TRIGGER IF EXISTS core_inventoryitem_fts_ad",
+    "DROP TRIGGER IF EXISTS core_inventoryitem_fts_au",
+    "DROP TABLE IF EXISTS core_inventoryitem_fts",
+]
+POSTGRES_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS inventoryitem_name_trgm_idx ON core_inventoryitem USING gin (name gin_trgm_ops)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS inventoryitem_name_trgm_idx",
+]
+
+
+def _run(schema_editor, sqlite, postgresql):
+    vendor = schema_editor.connection.vendor
+    for statement in sqlite if vendor == 'sqlite' else postgresql if vendor == 'postgresql' else []:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    # pg_trgm GIN index on PostgreSQL, FTS5 trigram table kept in sync by triggers on SQLite
+    _run(schema_editor, SQLITE_CREATE, POSTGRES_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, SQLITE_DROP, POSTGRES_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_stock_alerts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
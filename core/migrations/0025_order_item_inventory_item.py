@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_inventory_name_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='item',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_items', to='core.inventoryitem'),
+        ),
+    ]
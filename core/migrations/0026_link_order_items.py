@@ -0,0 +1,43 @@
+from django.db import migrations, transaction
+from django.db.models import Case, Count, Min, Value, When
+
+BATCH_SIZE = 5000
+
+
+def link_order_items(apps, schema_editor):
+    # Point existing lines at the inventory item with the same name, when exactly one exists.
+    # Lines are walked in primary key ranges, each committed on its own, so no long lock is held.
+    InventoryItem = apps.get_model('core', 'InventoryItem')
+    OrderItem = apps.get_model('core', 'OrderItem')
+    last_pk = 0
+    while True:
+        pks = list(OrderItem.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:BATCH_SIZE])
+        if not pks:
+            break
+        batch = OrderItem.objects.filter(pk__gte=pks[0], pk__lte=pks[-1], item__isnull=True)
+        last_pk = pks[-1]
+
+        names = set(batch.values_list('product_name', flat=True))
+        item_ids = {
+            row['name']: row['item_id']
+            for row in InventoryItem.objects.filter(name__in=names)
+            .values('name').annotate(count=Count('id'), item_id=Min('id')).order_by()
+            if row['count'] == 1
+        }
+        if item_ids:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                batch.filter(product_name__in=list(item_ids)).update(
+                    item_id=Case(*[When(product_name=name, then=Value(pk)) for name, pk in item_ids.items()]),
+                )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0025_order_item_inventory_item'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_order_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 12:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_link_order_items'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('reason', models.CharField(choices=[('opening', 'Opening balance'), ('adjustment', 'Adjustment'), ('import', 'Import'), ('order', 'Order received')], default='adjustment', max_length=20)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('executing_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='core.inventoryitem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['item', 'date_created'], name='stockmovement_item_date_idx'), models.Index(fields=['date_created'], name='stockmovement_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField()),
+                ('quantity', models.IntegerField()),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='core.inventoryitem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['taken_at'], name='stocksnapshot_taken_idx')],
+                'constraints': [models.UniqueConstraint(fields=('item', 'taken_at'), name='unique_stock_snapshot')],
+            },
+        ),
+    ]
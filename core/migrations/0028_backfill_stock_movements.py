@@ -0,0 +1,115 @@
+import gzip
+import json
+from datetime import datetime
+
+from django.db import migrations, transaction
+from django.db.models import Min, Sum
+
+BATCH_SIZE = 2000
+
+
+def _count(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _archived_rows(ChangeArchive):
+    # Archive batches hold gzip-compressed JSON lines, with datetimes in ISO 8601 ("Z" for UTC);
+    # read here rather than through core.archive so this migration doesn't follow later changes
+    batches = ChangeArchive.objects.filter(source='inventory_changes').order_by('first_executed', 'id')
+    for data in batches.values_list('data', flat=True).iterator(chunk_size=10):
+        for line in gzip.decompress(bytes(data)).decode('utf-8').splitlines():
+            if line:
+                row = json.loads(line)
+                executed = row['date_executed']
+                row['date_executed'] = datetime.fromisoformat(executed[:-1] + '+00:00' if executed.endswith('Z') else executed)
+                yield row
+
+
+def _movement(StockMovement, recorded, item_id, old_value, new_value, date_executed):
+    # Log entries from the point the running code started recording an item are already in the ledger
+    if item_id in recorded and date_executed >= recorded[item_id][0]:
+        return None
+    old_value, new_value = _count(old_value), _count(new_value)
+    if old_value is None or new_value is None or old_value == new_value:
+        return None
+    return StockMovement(item_id=item_id, delta=new_value - old_value, reason='adjustment', date_created=date_executed)
+
+
+def _archived_movements(InventoryItem, StockMovement, recorded, rows):
+    existing = set(InventoryItem.objects.filter(pk__in={row['item_id'] for row in rows}).values_list('pk', flat=True))
+    movements = (
+        _movement(StockMovement, recorded, row['item_id'], row['old_value'], row['new_value'], row['date_executed'])
+        for row in rows if row['item_id'] in existing
+    )
+    return [movement for movement in movements if movement is not None]
+
+
+def backfill_stock_movements(apps, schema_editor):
+    # Rebuild the ledger from the quantity change log, archived rows included: one movement per
+    # logged change, plus an opening movement at date_added that makes each item's movements add
+    # up to its current quantity. Work is done in batches, each committed on its own, so no long
+    # lock is held. Movements already written by the running code after 0027 are kept.
+    InventoryItem = apps.get_model('core', 'InventoryItem')
+    InventoryItemChanges = apps.get_model('core', 'InventoryItemChanges')
+    StockMovement = apps.get_model('core', 'StockMovement')
+    ChangeArchive = apps.get_model('core', 'ChangeArchive')
+    alias = schema_editor.connection.alias
+
+    recorded = {
+        row['item_id']: (row['first'], row['total'])
+        for row in StockMovement.objects.values('item_id').annotate(first=Min('date_created'), total=Sum('delta')).order_by()
+    }
+    totals = {}
+
+    def write(movements):
+        for movement in movements:
+            totals[movement.item_id] = totals.get(movement.item_id, 0) + movement.delta
+        with transaction.atomic(using=alias):
+            StockMovement.objects.bulk_create(movements, batch_size=BATCH_SIZE)
+
+    # Rows moved to ChangeArchive by archive_changelogs; those of deleted items are skipped
+    archived = []
+    for row in _archived_rows(ChangeArchive):
+        archived.append(row)
+        if len(archived) >= BATCH_SIZE:
+            write(_archived_movements(InventoryItem, StockMovement, recorded, archived))
+            archived = []
+    write(_archived_movements(InventoryItem, StockMovement, recorded, archived))
+
+    last_pk = 0
+    while True:
+        items = list(InventoryItem.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'quantity', 'date_added')[:BATCH_SIZE])
+        if not items:
+            break
+        last_pk = items[-1][0]
+
+        changes = (
+            InventoryItemChanges.objects.filter(item_id__in=[pk for pk, _, _ in items])
+            .order_by('item_id', 'date_executed', 'pk')
+            .values_list('item_id', 'old_value', 'new_value', 'date_executed')
+        )
+        write([
+            movement for movement in (_movement(StockMovement, recorded, *change) for change in changes.iterator(chunk_size=BATCH_SIZE))
+            if movement is not None
+        ])
+        openings = []
+        for pk, quantity, date_added in items:
+            opening = quantity - totals.get(pk, 0) - (recorded[pk][1] if pk in recorded else 0)
+            if opening:
+                openings.append(StockMovement(item_id=pk, delta=opening, reason='opening', date_created=date_added))
+        write(openings)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0027_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stock_movements, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,69 @@
-from django.db import models
+from django.db import DatabaseError, models, transaction
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 #from django.contrib.auth.models import User
 from django_currentuser.middleware import (get_current_user, get_current_authenticated_user)
 
 User = get_user_model()
 
+# Tracks the field values an instance was created or loaded with, so saves can find changed
+# fields in memory instead of re-reading the row first
+class TrackedFieldsMixin:
+    # Pass only the changed fields (plus auto_now fields) as update_fields on save()
+    auto_update_fields = True
+
+    def __init__(self, *args, **kwargs):
+        # from_db() builds instances through __init__ too, so this covers loaded rows
+        super().__init__(*args, **kwargs)
+        self._snapshot_loaded_values()
+
+    def _snapshot_loaded_values(self):
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields if field.attname not in deferred
+        }
+
+    def get_changed_fields(self):
+        """
+        Return {field name: (old value, new value)} for fields changed since the instance was
+        loaded, created or last saved. An instance built with a pk rather than loaded compares
+        against the values it was built with.
+        """
+        if self.pk is None:
+            return {}
+        loaded = self._loaded_values
+        changed = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in loaded and loaded[field.attname] != getattr(self, field.attname):
+                changed[field.name] = (loaded[field.attname], getattr(self, field.attname))
+        return changed
+
+    def save(self, *args, **kwargs):
+        """
+        Saving a loaded instance with changed fields writes only those fields (and the auto_now
+        ones). If the row was deleted in the meantime this raises DoesNotExist instead of
+        inserting it again; a save without changes behaves like Model.save().
+        """
+        forced = False
+        if (self.auto_update_fields and not args and not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None and not kwargs.get('force_insert')):
+            changed = list(self.get_changed_fields())
+            if changed:
+                auto_now = [field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+                kwargs['update_fields'] = changed + auto_now
+                forced = True
+        try:
+            super().save(*args, **kwargs)
+        except DatabaseError as e:
+            # Raised by Django itself, not the driver, when the UPDATE matched no row
+            if forced and type(e) is DatabaseError and e.__cause__ is None:
+                raise self.DoesNotExist(f"{self._meta.object_name} {self.pk} no longer exists.") from e
+            raise
+        self._snapshot_loaded_values()
+
 # Profile for each user
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -26,7 +84,7 @@ class Profile(models.Model):
 
 
 # Supplier model
-class Supplier(models.Model):
+class Supplier(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=255)
     contact_person = models.CharField(max_length=100, blank=True, null=True)
     contact_email = models.EmailField()
@@ -36,27 +94,60 @@ class Supplier(models.Model):
     date_modified = models.DateTimeField(auto_now=True)
     date_added = models.DateTimeField(auto_now_add=True)
 
+    # Auto-maintained timestamps are not worth an audit entry
+    AUDIT_EXCLUDE = ('date_modified', 'date_added')
+
+    def build_changelog(self):
+        """Return an unsaved Changelog row holding a diff of all unsaved changes, or None if nothing changed."""
+        changes = {
+            field_name: [old_value, new_value]
+            for field_name, (old_value, new_value) in self.get_changed_fields().items()
+            if field_name not in self.AUDIT_EXCLUDE
+        }
+        if not changes:
+            return None
+        entry = Changelog(
+            model_name="Supplier",
+            record_id=self.pk,
+            field_name=", ".join(changes)[:100],
+            changes=changes,
+            executing_user=get_current_authenticated_user(),
+        )
+        # Single field edits also fill the flat columns
+        if len(changes) == 1:
+            old_value, new_value = next(iter(changes.values()))
+            entry.old_value = None if old_value is None else str(old_value)[:255]
+            entry.new_value = None if new_value is None else str(new_value)[:255]
+        return entry
+
     def save(self, *args, **kwargs):
-        if self.pk is not None:
-            original = Supplier.objects.get(pk=self.pk)
-            fields = Supplier._meta.concrete_fields
-            changedfields = []
-            for field in fields:
-                if getattr(original,field.name) != getattr(self,field.name):
-                    Changelog.objects.create(
-                        model_name="Supplier",
-                        record_id=self.pk,
-                        field_name=field.name,
-                        old_value=getattr(original,field.name),
-                        new_value=getattr(self,field.name),
-                )
+        entry = self.build_changelog() if self.pk is not None else None
         super().save(*args, **kwargs)
+        if entry is not None:
+            entry.save()
+
+    @classmethod
+    def bulk_update_audited(cls, suppliers, fields):
+        """
+        bulk_update() the given fields on already-modified suppliers and write their changelog
+        rows with one bulk_create(), so the statement count doesn't grow with the number of fields.
+        """
+        entries = [entry for entry in (supplier.build_changelog() for supplier in suppliers) if entry is not None]
+        now = timezone.now()
+        for supplier in suppliers:
+            supplier.date_modified = now
+        with transaction.atomic():
+            cls.objects.bulk_update(suppliers, list(fields) + ['date_modified'])
+            Changelog.objects.bulk_create(entries)
+        for supplier in suppliers:
+            supplier._snapshot_loaded_values()
+        return len(entries)
 
     def __str__(self):
         return self.name
 
 # Inventory item model
-class InventoryItem(models.Model):
+class InventoryItem(TrackedFieldsMixin, models.Model):
     INSTOCK = 3
     LOWSTOCK = 2
     OUTOFSTOCK = 1
@@ -106,24 +197,40 @@ class InventoryItem(models.Model):
 
     def save(self, *args, **kwargs):
         self.status = self.calculate_inv_status()
-        if self.pk is not None:
-            original = InventoryItem.objects.get(pk=self.pk)
-            #fields = InventoryItem._meta.concrete_fields
-            #changedfields = []
-            if getattr(original,'quantity') != getattr(self,'quantity'):
-                InventoryItemChanges.objects.create(
-                    item=self,
-                    old_value=getattr(original,'quantity'),
-                    new_value=getattr(self,'quantity'),
-                    status=getattr(self,'status'),
-                )
-        super().save(*args,**kwargs)
+        # The change log, the row, the ledger and the alerts are written together or not at all
+        with transaction.atomic():
+            old_status = None
+            movement = (StockMovement.OPENING, self.quantity)
+            if self.pk is not None:
+                changed = self.get_changed_fields()
+                movement = None
+                if 'quantity' in changed:
+                    old_quantity, new_quantity = changed['quantity']
+                    InventoryItemChanges.objects.create(
+                        item=self,
+                        old_value=old_quantity,
+                        new_value=new_quantity,
+                        status=getattr(self,'status'),
+                    )
+                    movement = (StockMovement.ADJUSTMENT, int(new_quantity) - int(old_quantity))
+                old_status = changed['status'][0] if 'status' in changed else self.status
+            super().save(*args,**kwargs)
+            if movement is not None:
+                reason, delta = movement
+                StockMovement.record([(self.pk, delta)], reason, user=get_current_authenticated_user())
+            StockAlert.record_status_changes([(self, old_status)])
 
     def get_status_display(self):
         return self.INV_STATUS_CHOICES.get(self.status, "Unknown")
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Supports keyset pagination of the inventory list ordered by (name, id)
+            models.Index(fields=['name', 'id'], name='inventoryitem_name_id_idx'),
+            # Supports delta sync and the list ETag (max(date_modified))
+            models.Index(fields=['date_modified'], name='inventoryitem_modified_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -146,13 +253,38 @@ class Order(models.Model):
     expected_delivery = models.DateField(blank=True, null=True)
     date_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Orders page: default sort, and filtering by status/supplier within it
+            models.Index(fields=['date_ordered', 'id'], name='order_date_ordered_idx'),
+            models.Index(fields=['status', 'date_ordered'], name='order_status_date_idx'),
+            models.Index(fields=['supplier', 'date_ordered'], name='order_supplier_date_idx'),
+        ]
+
     def __str__(self):
         return self.order_number
 
+# Allocates order numbers: each row's auto-increment id is one order number, so
+# concurrent workers can never be handed the same number
+class OrderNumberSequence(models.Model):
+    date_allocated = models.DateTimeField(auto_now_add=True)
+
+    PREFIX = "ORD-"
+
+    @classmethod
+    def format_number(cls, value):
+        return f"{cls.PREFIX}{value:06d}"
+
+    def __str__(self):
+        return self.format_number(self.pk)
+
 # Model for items within an Order (Modified)
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items') # Changed related_name to 'items'
     product_name = models.CharField(max_length=255) # Changed from inventory_item ForeignKey
+    # The inventory item the line is posted to; product_name stays as the name it was ordered under.
+    # Null for lines whose name matched no single item yet; completion links them.
+    item = models.ForeignKey(InventoryItem, on_delete=models.SET_NULL, null=True, blank=True, related_name='order_items')
     quantity = models.PositiveIntegerField()
     # REMOVED price field for now
     # price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -205,12 +337,19 @@ class Changelog(models.Model):
     field_name = models.CharField(max_length=100)
     old_value = models.CharField(max_length=255, null=True)
     new_value = models.CharField(max_length=255, null=True)
+    # All fields changed by one save, as {field name: [old value, new value]}
+    changes = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
     executing_user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, editable=False)
     date_executed = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
         return f"{self.record_id}: {self.model_name} change {self.field_name} from {self.old_value} to {self.new_value}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_executed', 'id'], name='changelog_executed_idx'),
+        ]
+
 #Represents the inventory specific changelog
 class InventoryItemChanges(models.Model):
     INSTOCK = 3
@@ -239,6 +378,71 @@ class InventoryItemChanges(models.Model):
     
     class Meta:
         ordering = ['-date_executed']
+        indexes = [
+            # Newest-first history pages, overall and per item
+            models.Index(fields=['date_executed', 'id'], name='itemchanges_executed_idx'),
+            models.Index(fields=['item', 'date_executed'], name='itemchanges_item_executed_idx'),
+        ]
+
+#Represents a CSV product import processed in the background
+class ImportJob(models.Model):
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    COMPLETED = 'COMPLETED'
+    FAILED = 'FAILED'
+    JOB_STATUS = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    )
+    file_name = models.CharField(max_length=255)
+    # Uploaded file contents, kept in the database so any worker process can pick the job up
+    data = models.BinaryField(null=True, editable=False)
+    status = models.CharField(max_length=20, choices=JOB_STATUS, default=PENDING, db_index=True)
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, editable=False)
+    date_added = models.DateTimeField(auto_now_add=True)
+    date_started = models.DateTimeField(null=True, blank=True)
+    date_finished = models.DateTimeField(null=True, blank=True)
+
+    def progress(self):
+        if not self.total_rows:
+            return 100 if self.status == self.COMPLETED else 0
+        return int(self.processed_rows * 100 / self.total_rows)
+
+    def __str__(self):
+        return f"Import {self.file_name} ({self.status})"
+
+#Records deleted inventory items so delta sync clients can drop them
+class InventoryItemDeletion(models.Model):
+    item_id = models.BigIntegerField()
+    date_deleted = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Inventory item {self.item_id} deleted {self.date_deleted}"
+
+#Counts committed inventory changes. Unlike max(date_modified), it also moves for a change that
+#commits late with an older timestamp, so it can validate cached inventory responses
+class InventoryVersion(models.Model):
+    value = models.BigIntegerField(default=0)
+
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(pk=1).update(value=models.F('value') + 1):
+            cls.objects.get_or_create(pk=1, defaults={'value': 1})
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list('value', flat=True).first() or 0
+
+    def __str__(self):
+        return f"Inventory version {self.value}"
 
 # -------------------------------
 # Signals to automatically create and save a Profile when a User is created
@@ -255,4 +459,177 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     # Ensure that the profile exists before trying to save it
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+#Holds one compressed batch of archived change history rows, partitioned by month
+class ChangeArchive(models.Model):
+    INVENTORY_CHANGES = 'inventory_changes'
+    CHANGELOG = 'changelog'
+    ARCHIVE_SOURCES = (
+        (INVENTORY_CHANGES, 'Inventory item changes'),
+        (CHANGELOG, 'Changelog'),
+    )
+    source = models.CharField(max_length=30, choices=ARCHIVE_SOURCES)
+    # First day of the month the archived rows were executed in
+    period = models.DateField()
+    first_executed = models.DateTimeField()
+    last_executed = models.DateTimeField()
+    row_count = models.PositiveIntegerField()
+    # gzip-compressed JSON lines, one archived row per line
+    data = models.BinaryField(editable=False)
+    date_archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', 'period'], name='changearchive_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_source_display()} {self.period:%Y-%m}: {self.row_count} rows"
+
+#Records an inventory item crossing into or out of a low/out-of-stock status
+class StockAlertEvent(models.Model):
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='alert_events')
+    old_status = models.IntegerField(choices=InventoryItem.INV_STATUS_CHOICES.items(), null=True)
+    new_status = models.IntegerField(choices=InventoryItem.INV_STATUS_CHOICES.items())
+    quantity = models.IntegerField()
+    threshold = models.IntegerField()
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['item', 'date_created'], name='stockalertevent_item_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item}: {self.get_old_status_display()} -> {self.get_new_status_display()}"
+
+#Represents an open low/out-of-stock alert; one row per item currently below its threshold
+class StockAlert(models.Model):
+    ALERT_STATUSES = (InventoryItem.LOWSTOCK, InventoryItem.OUTOFSTOCK)
+
+    item = models.OneToOneField(InventoryItem, on_delete=models.CASCADE, related_name='stock_alert')
+    status = models.IntegerField(choices=InventoryItem.INV_STATUS_CHOICES.items())
+    date_opened = models.DateTimeField(auto_now_add=True)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'date_opened'], name='stockalert_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item}: {self.get_status_display()}"
+
+    @classmethod
+    def record_status_changes(cls, changes):
+        """
+        Update the open alerts for saved items. `changes` is a list of (item, old status) pairs,
+        with None as the old status of new items. Each status change into, out of or between
+        the alert statuses is logged as a StockAlertEvent, alerts are opened or updated for items
+        now low or out of stock and closed for the rest. Escalating to out of stock clears the
+        acknowledgements so everyone sees the alert again.
+        """
+        # Moves between statuses that aren't alerts (e.g. a new item that is in stock) aren't crossings
+        changes = [
+            (item, old_status) for item, old_status in changes
+            if item.status != old_status and (item.status in cls.ALERT_STATUSES or old_status in cls.ALERT_STATUSES)
+        ]
+        if not changes:
+            return
+
+        StockAlertEvent.objects.bulk_create([
+            StockAlertEvent(item=item, old_status=old_status, new_status=item.status, quantity=item.quantity, threshold=item.threshold)
+            for item, old_status in changes
+        ])
+
+        closed = [item.pk for item, old_status in changes if item.status not in cls.ALERT_STATUSES]
+        if closed:
+            cls.objects.filter(item_id__in=closed).delete()
+
+        opened = [item for item, old_status in changes if item.status in cls.ALERT_STATUSES]
+        if opened:
+            now = timezone.now()
+            cls.objects.bulk_create(
+                [cls(item=item, status=item.status, date_opened=now, date_updated=now) for item in opened],
+                update_conflicts=True,
+                unique_fields=['item'],
+                update_fields=['status', 'date_updated'],
+            )
+        escalated = [
+            item.pk for item, old_status in changes
+            if old_status == InventoryItem.LOWSTOCK and item.status == InventoryItem.OUTOFSTOCK
+        ]
+        if escalated:
+            StockAlertAcknowledgement.objects.filter(alert__item_id__in=escalated).delete()
+
+#Records that a user has seen an open stock alert
+class StockAlertAcknowledgement(models.Model):
+    alert = models.ForeignKey(StockAlert, on_delete=models.CASCADE, related_name='acknowledgements')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stock_alert_acknowledgements')
+    date_acknowledged = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['alert', 'user'], name='unique_stock_alert_acknowledgement'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} acknowledged {self.alert}"
+
+#Represents one change to an item's stock as a signed quantity; summing an item's movements
+#up to a moment gives its stock at that moment
+class StockMovement(models.Model):
+    OPENING = 'opening'
+    ADJUSTMENT = 'adjustment'
+    IMPORT = 'import'
+    ORDER = 'order'
+    MOVEMENT_REASONS = (
+        (OPENING, 'Opening balance'),
+        (ADJUSTMENT, 'Adjustment'),
+        (IMPORT, 'Import'),
+        (ORDER, 'Order received'),
+    )
+
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='stock_movements')
+    delta = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=MOVEMENT_REASONS, default=ADJUSTMENT)
+    executing_user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    date_created = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Deltas of one item, or of every item, after a snapshot and up to a moment
+            models.Index(fields=['item', 'date_created'], name='stockmovement_item_date_idx'),
+            models.Index(fields=['date_created'], name='stockmovement_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item}: {self.delta:+d} ({self.get_reason_display()})"
+
+    @classmethod
+    def record(cls, movements, reason, user=None, moment=None):
+        """Write (item id, delta) pairs with one bulk INSERT, skipping zero deltas."""
+        moment = moment or timezone.now()
+        cls.objects.bulk_create([
+            cls(item_id=item_id, delta=delta, reason=reason, executing_user=user, date_created=moment)
+            for item_id, delta in movements if delta
+        ], batch_size=2000)
+
+#Represents an item's stock at the moment a periodic snapshot was taken
+class StockSnapshot(models.Model):
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='stock_snapshots')
+    taken_at = models.DateTimeField()
+    quantity = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item', 'taken_at'], name='unique_stock_snapshot'),
+        ]
+        indexes = [
+            # Finding the latest snapshot at or before a moment, for the whole catalogue
+            models.Index(fields=['taken_at'], name='stocksnapshot_taken_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item}: {self.quantity} at {self.taken_at}"
@@ -0,0 +1,259 @@
+# core/orders.py
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Min, Q, Sum, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .dashboard import invalidate_dashboard_snapshot
+from .events import notify_inventory_changed
+from .list_cache import bump_list_generation
+from .models import InventoryItem, InventoryItemChanges, Order, OrderItem, OrderNumberSequence, StockAlert, StockMovement, Supplier
+
+# Items updated per UPDATE ... CASE statement
+POSTING_BATCH_SIZE = 500
+
+
+def _case_by_pk(values):
+    return Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+        output_field=IntegerField(),
+    )
+
+
+def unique_item_ids(names, model=InventoryItem):
+    """
+    Map each name to the id of the only inventory item with that name, using the name index.
+    Names matching no item or several items are left out.
+    """
+    names = list(names)
+    ids = {}
+    for start in range(0, len(names), POSTING_BATCH_SIZE):
+        rows = (
+            model.objects.filter(name__in=names[start:start + POSTING_BATCH_SIZE])
+            .values('name').annotate(count=Count('id'), item_id=Min('id')).order_by()
+        )
+        ids.update((row['name'], row['item_id']) for row in rows if row['count'] == 1)
+    return ids
+
+
+def link_order_items(order_item_filter, item_ids):
+    """Point the unlinked order items matching the filter at {product_name: item id}, in batched UPDATEs."""
+    names = list(item_ids)
+    for start in range(0, len(names), POSTING_BATCH_SIZE):
+        batch = names[start:start + POSTING_BATCH_SIZE]
+        OrderItem.objects.filter(order_item_filter, item__isnull=True, product_name__in=batch).update(
+            item_id=Case(*[When(product_name=name, then=Value(item_ids[name])) for name in batch]),
+        )
+
+
+def post_order_items_to_inventory(order_ids, user=None):
+    """
+    Add the item quantities of the given orders to inventory.
+
+    Quantities are summed per linked inventory item across all orders. Lines without an item
+    (older orders, or names that matched nothing when the order was placed) are resolved by name
+    once and linked; missing items are created with one bulk INSERT. The increments are applied
+    with F() expressions in one UPDATE per POSTING_BATCH_SIZE items and an InventoryItemChanges row
+    is written for every item. Must run inside a transaction. Returns a list of error messages.
+    """
+    lines = OrderItem.objects.filter(order_id__in=order_ids)
+    totals = {
+        row['item_id']: row['total']
+        for row in lines.filter(item__isnull=False).values('item_id').annotate(total=Sum('quantity')).order_by()
+    }
+    unlinked = {
+        row['product_name']: row['total']
+        for row in lines.filter(item__isnull=True).values('product_name').annotate(total=Sum('quantity')).order_by()
+    }
+
+    errors = []
+    if unlinked:
+        by_name = {}
+        duplicates = set()
+        for pk, name in InventoryItem.objects.filter(name__in=list(unlinked)).order_by('id').values_list('pk', 'name'):
+            if name in by_name:
+                duplicates.add(name)
+            else:
+                by_name[name] = pk
+        errors = [f"More than one inventory item is named {name}; its quantity was not updated." for name in sorted(duplicates)]
+
+        missing = [
+            InventoryItem(name=name, quantity=0, threshold=0, status=InventoryItem.UNKNOWN)
+            for name in unlinked if name not in by_name
+        ]
+        for item in InventoryItem.objects.bulk_create(missing):
+            by_name[item.name] = item.pk
+
+        resolved = {name: pk for name, pk in by_name.items() if name not in duplicates}
+        link_order_items(Q(order_id__in=order_ids), resolved)
+        for name, pk in resolved.items():
+            totals[pk] = totals.get(pk, 0) + unlinked[name]
+
+    if not totals:
+        return errors
+
+    # Lock the affected rows so the quantities read here stay accurate until the UPDATE
+    items = InventoryItem.objects.select_for_update().filter(pk__in=list(totals)).order_by('id')
+
+    now = timezone.now()
+    changes = []
+    status_changes = []
+    increments = {}
+    statuses = {}
+    for item in items:
+        total = totals[item.pk]
+        old_quantity = item.quantity
+        status_changes.append((item, item.status))
+        item.quantity = old_quantity + total
+        item.status = item.calculate_inv_status()
+        increments[item.pk] = total
+        statuses[item.pk] = item.status
+        changes.append(InventoryItemChanges(
+            item=item,
+            old_value=old_quantity,
+            new_value=item.quantity,
+            status=item.status,
+            executing_user=user,
+        ))
+
+    pks = list(increments)
+    for start in range(0, len(pks), POSTING_BATCH_SIZE):
+        batch = pks[start:start + POSTING_BATCH_SIZE]
+        InventoryItem.objects.filter(pk__in=batch).update(
+            quantity=F('quantity') + _case_by_pk({pk: increments[pk] for pk in batch}),
+            status=_case_by_pk({pk: statuses[pk] for pk in batch}),
+            date_modified=now,
+        )
+    InventoryItemChanges.objects.bulk_create(changes)
+    StockMovement.record(increments.items(), StockMovement.ORDER, user=user, moment=now)
+    StockAlert.record_status_changes(status_changes)
+    bump_list_generation(InventoryItem)
+    notify_inventory_changed()
+    return errors
+
+
+def update_order_status(order_ids, new_status, user=None):
+    """
+    Set the status of the given orders in one UPDATE. Orders moving from PENDING to COMPLETED have
+    their items posted to inventory in the same transaction.
+
+    Returns (number of orders updated, list of inventory error messages).
+    """
+    with transaction.atomic():
+        current = list(
+            Order.objects.select_for_update().filter(pk__in=order_ids)
+            .exclude(status=new_status).values_list('id', 'status')
+        )
+        if not current:
+            return 0, []
+
+        Order.objects.filter(pk__in=[pk for pk, _ in current]).update(status=new_status, date_modified=timezone.now())
+
+        errors = []
+        if new_status == 'COMPLETED':
+            completed = [pk for pk, previous_status in current if previous_status == 'PENDING']
+            if completed:
+                errors = post_order_items_to_inventory(completed, user=user)
+
+    # update() and bulk_create() don't send the save signals that refresh the dashboard and lists
+    invalidate_dashboard_snapshot()
+    bump_list_generation(Order)
+    return len(current), errors
+
+
+class OrderValidationError(Exception):
+    """Raised when an order payload is not valid; nothing has been written."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def clean_order_payload(data, suppliers):
+    """
+    Validate one order payload ({'supplier', 'expectedDelivery', 'items'}) against the given
+    {id: Supplier} map and return the cleaned (supplier, expected_delivery, [(product_name, quantity)]).
+    """
+    if not isinstance(data, dict):
+        raise OrderValidationError('Each order must be a JSON object.')
+
+    supplier_id = data.get('supplier')
+    items_data = data.get('items') # Expecting a list of items
+    if not supplier_id:
+        raise OrderValidationError('Supplier is required.')
+    if not items_data or not isinstance(items_data, list):
+        raise OrderValidationError('Order must contain at least one item.')
+
+    try:
+        supplier = suppliers.get(int(supplier_id))
+    except (ValueError, TypeError):
+        supplier = None
+    if supplier is None:
+        raise OrderValidationError('Supplier not found.', status=404)
+
+    expected_delivery = data.get('expectedDelivery') or None
+    if expected_delivery is not None:
+        try:
+            expected_delivery = parse_date(str(expected_delivery))
+        except ValueError:
+            expected_delivery = None
+        if expected_delivery is None:
+            raise OrderValidationError('Expected delivery must be a date (YYYY-MM-DD).')
+
+    items = []
+    for item_data in items_data:
+        if not isinstance(item_data, dict):
+            raise OrderValidationError('Each item must be a JSON object.')
+        product_name = str(item_data.get('product_name') or '').strip()
+        if not product_name:
+            raise OrderValidationError('All items must have a product name.')
+        try:
+            quantity = int(item_data.get('quantity'))
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+        except (ValueError, TypeError):
+            raise OrderValidationError(f'Invalid quantity for product "{product_name}". Must be a positive whole number.')
+        items.append((product_name, quantity))
+    return supplier, expected_delivery, items
+
+
+def load_suppliers(payloads):
+    """Fetch every supplier referenced by a list of order payloads in one query."""
+    ids = set()
+    for data in payloads:
+        try:
+            ids.add(int(data.get('supplier')))
+        except (AttributeError, ValueError, TypeError):
+            continue
+    return Supplier.objects.in_bulk(ids)
+
+
+def allocate_order_numbers(count):
+    """Reserve `count` unique order numbers with one bulk INSERT into the sequence table."""
+    rows = OrderNumberSequence.objects.bulk_create([OrderNumberSequence() for _ in range(count)])
+    return [OrderNumberSequence.format_number(row.pk) for row in rows]
+
+
+def create_orders(cleaned_orders):
+    """
+    Create already validated orders and their items in one transaction with bulk inserts.
+    `cleaned_orders` is a list of clean_order_payload() results. Lines are linked to the inventory
+    item of the same name when exactly one exists. Returns the created orders.
+    """
+    with transaction.atomic():
+        numbers = allocate_order_numbers(len(cleaned_orders))
+        orders = Order.objects.bulk_create([
+            Order(order_number=number, supplier=supplier, expected_delivery=expected_delivery)
+            for number, (supplier, expected_delivery, items) in zip(numbers, cleaned_orders)
+        ])
+        item_ids = unique_item_ids({product_name for _, _, items in cleaned_orders for product_name, _ in items})
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product_name=product_name, item_id=item_ids.get(product_name), quantity=quantity)
+            for order, (supplier, expected_delivery, items) in zip(orders, cleaned_orders)
+            for product_name, quantity in items
+        ])
+
+    # bulk_create() doesn't send the save signals that refresh the dashboard and lists
+    invalidate_dashboard_snapshot()
+    bump_list_generation(Order)
+    return orders
@@ -0,0 +1,75 @@
+# core/pagination.py
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page into an opaque cursor token."""
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token):
+    """Decode a cursor token back into its list of sort key values. Raises ValueError if invalid."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+def parse_limit(value, default=100, maximum=1000):
+    """Parse a page size query parameter, clamped to 1..maximum."""
+    if value in (None, ''):
+        return default
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(limit, maximum)
+
+
+def keyset_page(queryset, sort_field, cursor, limit, descending=False, pk_field='id'):
+    """
+    Return one page of a queryset ordered by (sort_field, pk_field) using keyset pagination.
+
+    The queryset should already be a .values()/.values_list() projection that includes both the
+    sort field and the primary key. Returns (rows, next_cursor) where next_cursor is None on the last page.
+    """
+    if descending:
+        queryset = queryset.order_by(f'-{sort_field}', f'-{pk_field}')
+    else:
+        queryset = queryset.order_by(sort_field, pk_field)
+
+    if cursor:
+        last_value, last_pk = decode_cursor(cursor)
+        op = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{sort_field}__{op}': last_value}) |
+            Q(**{sort_field: last_value, f'{pk_field}__{op}': last_pk})
+        )
+
+    # Fetch one extra row to know whether another page exists without a COUNT(*)
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[sort_field], last[pk_field]])
+    return rows, next_cursor
+
+
+class ChangeHistoryCursorPagination(CursorPagination):
+    """
+    Newest-first cursor pagination for append-only history tables. The id tie-breaker keeps
+    rows written in the same bulk insert (same timestamp) in a stable order across pages.
+    """
+    ordering = ('-date_executed', '-id')
+    page_size = 100
+    page_size_query_param = 'limit'
+    max_page_size = 1000
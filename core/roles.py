@@ -1,4 +1,10 @@
 # core/roles.py
+import time
+import uuid
+
+from django.core.cache import cache
+
+from .models import Profile
 
 # Only Admin/Owner should access settings
 ROLE_SETTINGS_ACCESS = ['Admin', 'Owner']
@@ -14,3 +20,55 @@ ROLE_REPORTS_ACCESS = ['Admin', 'Owner', 'Manager']
 
 # Admin/Owner/Manager should access suppliers
 ROLE_SUPPLIERS_ACCESS = ['Admin', 'Owner', 'Manager']
+
+
+# Effective roles are cached in the session under this key
+ROLES_SESSION_KEY = '_effective_roles'
+# Re-resolve at least this often, so a change made in another process (with a per-process
+# cache) still reaches every session
+ROLES_SESSION_TTL = 300
+
+
+def _roles_version_key(user_id):
+    return f'roles:version:{user_id}'
+
+
+def invalidate_user_roles(user_id):
+    """Make every session of the user re-resolve its roles on the next request."""
+    cache.set(_roles_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def resolve_roles(user):
+    """Look up a user's roles: the profile role plus the names of their groups."""
+    roles = set(user.groups.values_list('name', flat=True))
+    role = Profile.objects.filter(user=user).values_list('role', flat=True).first()
+    if role:
+        roles.add(role)
+    return roles
+
+
+def get_effective_roles(request):
+    """
+    Return the set of roles of the request's user, resolved once per session and reused until
+    the user's roles change (see invalidate_user_roles) or ROLES_SESSION_TTL passes. A cache
+    hit runs no queries; a miss only writes the session.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return set()
+
+    version = cache.get(_roles_version_key(user.pk))
+    cached = request.session.get(ROLES_SESSION_KEY)
+    now = int(time.time())
+    if (cached and cached['user'] == user.pk and cached['version'] == version
+            and now - cached['resolved'] < ROLES_SESSION_TTL):
+        return set(cached['roles'])
+
+    roles = resolve_roles(user)
+    request.session[ROLES_SESSION_KEY] = {
+        'user': user.pk,
+        'version': version,
+        'resolved': now,
+        'roles': sorted(roles),
+    }
+    return roles
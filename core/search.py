@@ -0,0 +1,176 @@
+# core/search.py
+import re
+from functools import lru_cache
+
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import InventoryItem
+
+# SQLite full text index over InventoryItem.name (external content, kept in sync by triggers),
+# created by migration 0024. A later migration that rebuilds core_inventoryitem on SQLite drops
+# the triggers and has to create them again.
+SQLITE_FTS_TABLE = 'core_inventoryitem_fts'
+
+# Trigram matching needs at least this many characters; shorter queries only match substrings
+SEARCH_MIN_TRIGRAM_LENGTH = 3
+SEARCH_MAX_QUERY_LENGTH = 100
+# Lowest word similarity (0..1) for a typo-tolerant match, pg_trgm's default similarity threshold
+SEARCH_MIN_SIMILARITY = 0.3
+# Typo-tolerant matches are ranked from at most this many index hits and at most this many are kept
+SEARCH_FUZZY_CANDIDATES = 500
+SEARCH_FUZZY_LIMIT = 50
+
+MATCH_PREFIX, MATCH_SUBSTRING, MATCH_FUZZY = 'prefix', 'substring', 'fuzzy'
+
+def normalize_query(query):
+    return ' '.join(query.split())[:SEARCH_MAX_QUERY_LENGTH]
+
+
+@lru_cache(maxsize=10000)
+def _word_trigrams(word):
+    # Padded like pg_trgm: two spaces before the word and one after
+    padded = f'  {word} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _words(text):
+    return re.findall(r'[^\W_]+', text.lower())
+
+
+def word_similarity(query, name):
+    """
+    Greatest trigram similarity between the query and any run of consecutive words in the name,
+    close to pg_trgm's word_similarity(), so both databases rank the same way.
+    """
+    query_trigrams = frozenset().union(*map(_word_trigrams, _words(query)))
+    if not query_trigrams:
+        return 0.0
+    name_trigrams = [_word_trigrams(word) for word in _words(name)]
+    # The best run starts and ends with a word sharing trigrams with the query; any other word
+    # at either end only grows the union
+    shared = [index for index, trigrams in enumerate(name_trigrams) if not trigrams.isdisjoint(query_trigrams)]
+    best = 0.0
+    for start in shared:
+        extent = set()
+        for index in range(start, shared[-1] + 1):
+            extent |= name_trigrams[index]
+            if index in shared:
+                common = len(query_trigrams & extent)
+                best = max(best, common / (len(query_trigrams) + len(extent) - common))
+    return best
+
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _substring_matches(query):
+    items = InventoryItem.objects.all()
+    if connection.vendor == 'sqlite' and len(query) >= SEARCH_MIN_TRIGRAM_LENGTH:
+        # A phrase query on the trigram index matches the query anywhere in the name, case-insensitively
+        return items.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [_fts_phrase(query)],
+        ))
+    # On PostgreSQL ILIKE is served by the trigram GIN index
+    return items.filter(name__icontains=query)
+
+
+def _fuzzy_candidate_ids(query):
+    """Ids of items that share trigrams with the query without containing it, best matches first."""
+    if connection.vendor == 'sqlite':
+        trigrams = sorted({word[i:i + 3] for word in _words(query) for i in range(len(word) - 2)})
+        if not trigrams:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s "
+                f"AND rowid NOT IN (SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s) "
+                f"ORDER BY rank LIMIT %s",
+                [' OR '.join(map(_fts_phrase, trigrams)), _fts_phrase(query), SEARCH_FUZZY_CANDIDATES],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    if connection.vendor == 'postgresql':
+        # Imported here so the app still loads where psycopg isn't installed; django.contrib.postgres
+        # isn't in INSTALLED_APPS, so the lookup is used directly instead of name__trigram_word_similar
+        from django.contrib.postgres.lookups import TrigramWordSimilar
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        # The %> operator uses the GIN index; lower its threshold for this query only
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(SEARCH_MIN_SIMILARITY)])
+            return list(
+                InventoryItem.objects.filter(TrigramWordSimilar(F('name'), query))
+                .exclude(name__icontains=query)
+                .annotate(similarity=TrigramWordSimilarity(query, 'name'))
+                .order_by('-similarity', 'id')
+                .values_list('id', flat=True)[:SEARCH_FUZZY_CANDIDATES]
+            )
+
+    return []
+
+
+def _fuzzy_matches(query, fields):
+    ids = _fuzzy_candidate_ids(query)
+    if not ids:
+        return []
+    rows = []
+    for row in InventoryItem.objects.filter(id__in=ids).values(*fields):
+        score = word_similarity(query, row['name'])
+        if score >= SEARCH_MIN_SIMILARITY:
+            rows.append({**row, 'match': MATCH_FUZZY, 'score': round(score, 3)})
+    rows.sort(key=lambda row: (-row['score'], row['name'], row['id']))
+    return rows[:SEARCH_FUZZY_LIMIT]
+
+
+def _ranked_substring_page(substring, query, offset, limit, fields):
+    """Rows offset..offset+limit of the substring matches, prefix matches first, each by word similarity."""
+    is_prefix = Case(When(name__istartswith=query, then=Value(1)), default=Value(0), output_field=IntegerField())
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return list(
+            substring
+            .annotate(is_prefix=is_prefix, score=TrigramWordSimilarity(query, 'name'))
+            .order_by('-is_prefix', '-score', 'name', 'id')
+            .values(*fields, 'is_prefix', 'score')[offset:offset + limit]
+        )
+
+    # SQLite has no trigram similarity, so every match is scored here and only the page is loaded
+    ranked = sorted(
+        (-prefix, -word_similarity(query, name), name, pk)
+        for pk, name, prefix in substring.annotate(is_prefix=is_prefix).values_list('id', 'name', 'is_prefix')
+    )[offset:offset + limit]
+    rows = {row['id']: row for row in InventoryItem.objects.filter(id__in=[pk for *_, pk in ranked]).values(*fields)}
+    return [{**rows[pk], 'is_prefix': -prefix, 'score': -score} for prefix, score, _, pk in ranked]
+
+
+def search_inventory(query, offset=0, limit=20, fields=('id', 'name')):
+    """
+    Rank inventory items by how well their name matches the query and return (rows, total) for
+    rows offset..offset+limit. Prefix matches come first, then names containing the query, then
+    typo-tolerant trigram matches; within each group rows are ordered by their 0..1 word
+    similarity `score`, and each row carries its `match` kind. `fields` must include 'id'.
+    """
+    query = normalize_query(query)
+    if not query:
+        return [], 0
+
+    substring = _substring_matches(query)
+    substring_count = substring.count()
+    fuzzy = _fuzzy_matches(query, fields) if len(query) >= SEARCH_MIN_TRIGRAM_LENGTH else []
+
+    rows = []
+    if offset < substring_count:
+        for row in _ranked_substring_page(substring, query, offset, limit, fields):
+            row['match'] = MATCH_PREFIX if row.pop('is_prefix') else MATCH_SUBSTRING
+            row['score'] = round(row['score'], 3)
+            rows.append(row)
+
+    if len(rows) < limit:
+        start = max(0, offset - substring_count)
+        rows.extend(fuzzy[start:start + limit - len(rows)])
+
+    return rows, substring_count + len(fuzzy)
@@ -1,4 +1,8 @@
 # core/serializers.py
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Profile, InventoryItem, Supplier, Order, OrderItem, Report, Changelog, InventoryItemChanges
 from django.contrib.auth.models import User
@@ -60,4 +64,108 @@ class InventoryItemChangesSerializer(serializers.ModelSerializer):
                 data['employee_name'] = instance.executing_user.email
         else:
             data['employee_name'] = 'not available'
-        return data
\ No newline at end of file
+        return data
+
+
+def _drf_datetime(value, tz):
+    # Same output as serializers.DateTimeField: ISO 8601 in the current time zone, UTC as "Z"
+    if value is None:
+        return None
+    value = value.astimezone(tz).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def _column_converter(field):
+    """Function turning a values_list() value into what the ModelSerializer field would output, or None."""
+    if isinstance(field, models.DateTimeField):
+        return _drf_datetime
+    # Dates are left to the renderer, which writes them in ISO 8601 like DateField
+    if isinstance(field, models.DecimalField):
+        quantum = Decimal(1).scaleb(-field.decimal_places)
+        return lambda value, tz: f'{value.quantize(quantum):f}' if value is not None else None
+    return None
+
+
+class ValuesListSerializer:
+    """
+    Read-only list serializer that builds the rows of a `fields = '__all__'` ModelSerializer
+    straight from values_list() tuples, without creating model instances or serializer fields
+    per row. Subclasses set `model`, and may add `extra_fields` ({output name: lookup}) and
+    override `finish_row()`.
+    """
+    model = None
+    extra_fields = {}
+
+    def __init__(self):
+        # Same order as ModelSerializer: primary key, plain fields, then foreign keys
+        opts = self.model._meta
+        concrete = [opts.pk] + [field for field in opts.concrete_fields if not field.primary_key and not field.is_relation] \
+            + [field for field in opts.concrete_fields if not field.primary_key and field.is_relation]
+        self.names = [field.name for field in concrete] + list(self.extra_fields)
+        # A foreign key's name in values_list() gives its id, like PrimaryKeyRelatedField
+        self.lookups = [field.name for field in concrete] + list(self.extra_fields.values())
+        self.converters = [
+            (index, converter)
+            for index, converter in enumerate(_column_converter(field) for field in concrete)
+            if converter is not None
+        ]
+        # The database hands back UTC datetimes, which the renderer already writes as DRF does
+        self.utc_converters = [(index, converter) for index, converter in self.converters if converter is not _drf_datetime]
+
+    def finish_row(self, row):
+        return row
+
+    def _rows(self, tuples):
+        tz = timezone.get_current_timezone()
+        converters = self.utc_converters if timezone.get_current_timezone_name() == 'UTC' else self.converters
+        names, finish = self.names, self.finish_row
+        for values in tuples:
+            if converters:
+                values = list(values)
+                for index, converter in converters:
+                    values[index] = converter(values[index], tz)
+            yield finish(dict(zip(names, values)))
+
+    def values(self, queryset):
+        """The queryset as dicts with every column; cursor pagination can page through these."""
+        return queryset.values(*self.lookups)
+
+    def rows(self, queryset):
+        return list(self._rows(queryset.values_list(*self.lookups)))
+
+    def rows_from_values(self, dicts):
+        lookups = self.lookups
+        return list(self._rows([row[lookup] for lookup in lookups] for row in dicts))
+
+
+class InventoryItemListSerializer(ValuesListSerializer):
+    model = InventoryItem
+
+
+class SupplierListSerializer(ValuesListSerializer):
+    model = Supplier
+
+
+class OrderListSerializer(ValuesListSerializer):
+    model = Order
+
+
+class InventoryItemChangesListSerializer(ValuesListSerializer):
+    """Same rows as InventoryItemChangesSerializer, with the item and user names joined in."""
+    model = InventoryItemChanges
+    extra_fields = {
+        'item_name': 'item__name',
+        '_first_name': 'executing_user__first_name',
+        '_last_name': 'executing_user__last_name',
+        '_email': 'executing_user__email',
+    }
+
+    def finish_row(self, row):
+        first_name, last_name, email = row.pop('_first_name'), row.pop('_last_name'), row.pop('_email')
+        if row['executing_user'] is None:
+            row['employee_name'] = 'not available'
+        elif first_name and last_name:
+            row['employee_name'] = first_name + " " + last_name
+        else:
+            row['employee_name'] = email
+        return row
@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Profile
+from django.contrib.auth.models import Group
+from .models import Profile, InventoryItem, InventoryItemDeletion, Order, Supplier
+from .dashboard import invalidate_dashboard_snapshot
+from .roles import invalidate_user_roles
+from .events import notify_inventory_changed
+from .list_cache import bump_list_generation
 
 User = get_user_model()
 
@@ -14,3 +19,56 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, 'profile'):
         instance.profile.save()
+
+@receiver(post_save, sender=Profile)
+def invalidate_profile_roles(sender, instance, **kwargs):
+    invalidate_user_roles(instance.user_id)
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_group_membership_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_user_roles(instance.pk)
+        return
+    # Changed from the group side: pk_set holds user ids, or is None when the group is cleared
+    user_ids = pk_set if action != 'pre_clear' else instance.user_set.values_list('pk', flat=True)
+    for user_id in user_ids:
+        invalidate_user_roles(user_id)
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_roles(sender, instance, **kwargs):
+    # A renamed or deleted group changes the roles of every member
+    if not kwargs.get('created'):
+        for user_id in instance.user_set.values_list('pk', flat=True):
+            invalidate_user_roles(user_id)
+
+@receiver(post_delete, sender=InventoryItem)
+def record_inventory_item_deletion(sender, instance, **kwargs):
+    InventoryItemDeletion.objects.create(item_id=instance.pk)
+
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+@receiver(post_save, sender=Supplier)
+@receiver(post_delete, sender=Supplier)
+def invalidate_dashboard(sender, **kwargs):
+    invalidate_dashboard_snapshot()
+
+# Cached API lists (core.list_cache) of these models are only retired through this receiver and
+# the bulk write paths
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+@receiver(post_save, sender=Supplier)
+@receiver(post_delete, sender=Supplier)
+def bump_cached_lists(sender, **kwargs):
+    bump_list_generation(sender)
+
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+def publish_inventory_change(sender, **kwargs):
+    notify_inventory_changed()
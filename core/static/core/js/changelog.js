@@ -2,62 +2,90 @@
 document.addEventListener("DOMContentLoaded", function () {
     const changeLogTableBody = document.getElementById("changeLogTable");
     const searchInput = document.getElementById("changeLogSearch");
-    let changelogData = []; // Store changelog entries for filtering
+    const loadMoreButton = document.getElementById("changeLogLoadMore");
+    const PAGE_SIZE = 100;
+    let changelogData = []; // Store loaded changelog entries for filtering
+    let nextPageUrl = `/api/v1/changelog/?limit=${PAGE_SIZE}`; // null once every page is loaded
+    let loading = false;
 
-    // Fetch Change Log Entries from API
+    // Fetch the next page of Change Log Entries from the API (cursor paginated, newest first)
     function fetchChangeLogs() {
-        fetch('/api/v1/changelog/')
+        if (!nextPageUrl || loading) return;
+        loading = true;
+        loadMoreButton.disabled = true;
+
+        fetch(nextPageUrl)
         .then(response => response.json())
         .then(data => {
             console.log("Fetched Change Logs:", data);
-            changelogData = data;
-            updateChangeLogTable(data);
+            if (changelogData.length === 0) {
+                changeLogTableBody.innerHTML = ''; // Clear the placeholder rows
+            }
+            changelogData = changelogData.concat(data.results);
+            nextPageUrl = data.next;
+            appendChangeLogRows(filterEntries(data.results));
         })
-        .catch(error => console.error('Error fetching changelog data:', error));
+        .catch(error => console.error('Error fetching changelog data:', error))
+        .finally(() => {
+            loading = false;
+            loadMoreButton.disabled = false;
+            loadMoreButton.classList.toggle("d-none", !nextPageUrl);
+        });
     }
 
-    // Render Change Log Table
-    function updateChangeLogTable(data) {
-        changeLogTableBody.innerHTML = '';
+    function statusBadgeFor(status) {
+        switch (status) {
+            case 3:
+                return `<span class="badge bg-success">In-Stock</span>`;
+            case 2:
+                return `<span class="badge bg-warning text-dark">Low-Stock</span>`;
+            case 1:
+                return `<span class="badge bg-danger">Out-of-Stock</span>`;
+            default:
+                return `<span class="badge bg-warning text-dark">Unknown</span>`;
+        }
+    }
 
+    // Append rows to the Change Log Table
+    function appendChangeLogRows(data) {
         data.forEach(entry => {
-            let statusBadge;
-            switch (entry.status) {
-                case 3:
-                    statusBadge = `<span class="badge bg-success">In-Stock</span>`;
-                    break;
-                case 2:
-                    statusBadge = `<span class="badge bg-warning text-dark">Low-Stock</span>`;
-                    break;
-                case 1:
-                    statusBadge = `<span class="badge bg-danger">Out-of-Stock</span>`;
-                    break;
-                default:
-                    statusBadge = `<span class="badge bg-warning text-dark">Unknown</span>`;
-            }
-
             const row = document.createElement("tr");
             row.innerHTML = `
                 <td>${entry.date_executed}</td>
                 <td>${entry.employee_name}</td>
                 <td>Updated quantity</td>
                 <td>${entry.item_name} ${entry.old_value} -> ${entry.new_value}</td>
-                <td>${statusBadge}</td>
+                <td>${statusBadgeFor(entry.status)}</td>
             `;
             changeLogTableBody.appendChild(row);
         });
     }
 
-    // 🔍 Filter logs as user types
-    searchInput.addEventListener("keyup", function () {
+    // Entries of `data` matching the search box
+    function filterEntries(data) {
         const filter = searchInput.value.toLowerCase();
-        const filteredLogs = changelogData.filter(entry => {
-            const combined = `${entry.date_executed} ${entry.executing_user} ${entry.model_name} ${entry.field_name} ${entry.status}`.toLowerCase();
+        if (!filter) return data;
+        return data.filter(entry => {
+            const combined = `${entry.date_executed} ${entry.employee_name} ${entry.item_name} ${entry.old_value} ${entry.new_value}`.toLowerCase();
             return combined.includes(filter);
         });
-        updateChangeLogTable(filteredLogs);
+    }
+
+    // 🔍 Filter loaded logs as user types
+    searchInput.addEventListener("keyup", function () {
+        changeLogTableBody.innerHTML = '';
+        appendChangeLogRows(filterEntries(changelogData));
     });
 
-    // Fetch logs on page load
+    loadMoreButton.addEventListener("click", fetchChangeLogs);
+
+    // Load the next page when the button scrolls into view
+    if ("IntersectionObserver" in window) {
+        new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) fetchChangeLogs();
+        }).observe(loadMoreButton);
+    }
+
+    // Fetch the first page on page load
     fetchChangeLogs();
 });
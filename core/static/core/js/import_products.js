@@ -30,6 +30,66 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
+    function pollImportJob(statusUrl) {
+        return fetch(statusUrl)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Network response was not ok: ' + response.status);
+                }
+                return response.json();
+            })
+            .then(job => {
+                if (!job.done) {
+                    statusMessage.innerHTML = `<div class="spinner-border spinner-border-sm" role="status"></div> Importing products... ${job.processed_rows} of ${job.total_rows} rows (${job.progress}%)`;
+                    return new Promise(resolve => setTimeout(resolve, 1000)).then(() => pollImportJob(statusUrl));
+                }
+
+                statusMessage.classList.remove('alert-info');
+                if (job.status === 'COMPLETED') {
+                    // Success
+                    statusMessage.innerHTML = job.message;
+                    statusMessage.classList.add('alert-success');
+                    
+                    // Reset form
+                    form.reset();
+                    
+                    // Add a refresh button and auto-redirect after 2 seconds
+                    const refreshMsg = document.createElement('div');
+                    refreshMsg.className = 'mt-3';
+                    refreshMsg.innerHTML = `
+                        <p>Products imported successfully. Refreshing inventory table...</p>
+                        <div class="d-flex justify-content-between align-items-center">
+                            <div class="spinner-border spinner-border-sm" role="status"></div>
+                            <button class="btn btn-primary btn-sm" onclick="window.location.href='/invmanagement/'">
+                                Go to Inventory Now
+                            </button>
+                        </div>
+                    `;
+                    statusMessage.appendChild(refreshMsg);
+                    
+                    // Auto redirect after 2 seconds, unless there are row errors to read
+                    if (job.errors.length === 0) {
+                        setTimeout(() => {
+                            window.location.href = "/invmanagement/";
+                        }, 2000);
+                    } else {
+                        const errorList = document.createElement('ul');
+                        errorList.className = 'mt-2 mb-0 small';
+                        job.errors.forEach(rowError => {
+                            const li = document.createElement('li');
+                            li.textContent = rowError;
+                            errorList.appendChild(li);
+                        });
+                        statusMessage.appendChild(errorList);
+                    }
+                } else {
+                    // Error
+                    statusMessage.innerHTML = job.message || 'An error occurred during import.';
+                    statusMessage.classList.add('alert-danger');
+                }
+            });
+    }
+    
     form.addEventListener('submit', function(e) {
         e.preventDefault();
         
@@ -72,39 +132,14 @@ document.addEventListener('DOMContentLoaded', function() {
             return response.json();
         })
         .then(data => {
-            statusMessage.classList.remove('alert-info');
-            
-            if (data.success) {
-                // Success
-                statusMessage.innerHTML = data.message;
-                statusMessage.classList.add('alert-success');
-                
-                // Reset form
-                form.reset();
-                
-                // Add a refresh button and auto-redirect after 2 seconds
-                const refreshMsg = document.createElement('div');
-                refreshMsg.className = 'mt-3';
-                refreshMsg.innerHTML = `
-                    <p>Products imported successfully. Refreshing inventory table...</p>
-                    <div class="d-flex justify-content-between align-items-center">
-                        <div class="spinner-border spinner-border-sm" role="status"></div>
-                        <button class="btn btn-primary btn-sm" onclick="window.location.href='/invmanagement/'">
-                            Go to Inventory Now
-                        </button>
-                    </div>
-                `;
-                statusMessage.appendChild(refreshMsg);
-                
-                // Auto redirect after 2 seconds
-                setTimeout(() => {
-                    window.location.href = "/invmanagement/";
-                }, 2000);
-            } else {
-                // Error
+            if (!data.success) {
+                statusMessage.classList.remove('alert-info');
                 statusMessage.innerHTML = data.error || 'An error occurred during import.';
                 statusMessage.classList.add('alert-danger');
+                return;
             }
+            // The import runs in the background; poll its status until it finishes
+            return pollImportJob(data.status_url);
         })
         .catch(error => {
             // Handle network errors
@@ -3,6 +3,9 @@ $(document).ready(function () {
 
     // Constants and Variables
     const apiUrl = "/api/v1/items/";
+    const listUrl = "/inventory/items/";
+    const alertsUrl = "/inventory/alerts/";
+    const searchUrl = "/inventory/search/";
     const tableBody = $("#tableBody");
     let currentInventoryData = []; // Store current data for comparison if needed
     
@@ -76,36 +79,49 @@ $(document).ready(function () {
         updateRemoveButtons();
     });
 
-    function getViewedLowStockIds() {
-        return new Set(JSON.parse(localStorage.getItem("viewedLowStockIds") || "[]"));
+    // Open stock alerts this user hasn't acknowledged yet
+    async function fetchUnacknowledgedAlerts() {
+        const response = await fetch(alertsUrl, { cache: "no-store" });
+        if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+        return (await response.json()).alerts;
     }
 
-    function markAsViewed(productId) {
-        const viewed = getViewedLowStockIds();
-        viewed.add(productId.toString());
-        localStorage.setItem("viewedLowStockIds", JSON.stringify(Array.from(viewed)));
+    async function acknowledgeAlerts(itemIds) {
+        await fetch(`${alertsUrl}acknowledge/`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json", "X-CSRFToken": getCSRFToken() },
+            body: JSON.stringify({ items: itemIds }),
+        });
     }
 
+    // Delta sync state: items by id, the token for the next poll and the last ETag seen
+    const inventoryById = new Map();
+    let syncToken = null;
+    let syncEtag = null;
+
     async function fetchInventoryData(showModalOnLoad = false) {
         console.log("🔄 Fetching inventory data...");
 
         try {
-            const response = await fetch(apiUrl);
+            // The first poll is a full sync (since=0); later polls only receive changes
+            const headers = syncEtag ? { "If-None-Match": syncEtag } : {};
+            const response = await fetch(`${listUrl}?since=${syncToken || 0}`, { headers: headers, cache: "no-store" });
+            if (response.status === 304) {
+                console.log("👍 Inventory unchanged.");
+                return;
+            }
             if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
 
-            const data = await response.json();
-            console.log("✅ API Data Received:", data);
+            const delta = await response.json();
+            console.log("✅ API Data Received:", delta);
+
+            if (!syncToken) inventoryById.clear();
+            syncEtag = response.headers.get("ETag");
+            const data = applyDelta(delta);
 
-            // Store fetched data
-            currentInventoryData = data; 
-            
-            // Update the table UI
-            updateTable(data);
-            updateSelectAllCheckboxState();
-            
             // Only check for alerts and show modal on the initial load
             if (showModalOnLoad) {
-                const itemsToAlert = findUnviewedLowStockItems(data);
+                const itemsToAlert = await fetchUnacknowledgedAlerts();
                 if (itemsToAlert.length > 0) {
                     console.log("🚨 Found unviewed low stock items on load:", itemsToAlert);
                     showLowStockAlert(itemsToAlert); 
@@ -118,6 +134,27 @@ $(document).ready(function () {
         }
     }
 
+    // Apply a delta (changed items, deleted ids, next token) to the local copy and redraw the table
+    function applyDelta(delta) {
+        delta.deleted.forEach(id => inventoryById.delete(id));
+        delta.items.forEach(item => inventoryById.set(item.id, item));
+        syncToken = delta.token;
+
+        const data = Array.from(inventoryById.values()).sort((a, b) => a.name.localeCompare(b.name) || a.id - b.id);
+
+        // Store fetched data
+        currentInventoryData = data; 
+        
+        // Update the table UI, re-running an active search so its results stay current
+        if (searchQuery) {
+            runSearch();
+        } else {
+            updateTable(data);
+            updateSelectAllCheckboxState();
+        }
+        return data;
+    }
+
     // Update the Table with Fetched Data
     function updateTable(data) {
         console.log("🔄 Updating table with fetched data...");
@@ -169,22 +206,6 @@ $(document).ready(function () {
         console.log("✅ Table Updated Successfully!");
     }
 
-    // Finds items that are low/out-of-stock and haven't been viewed
-    function findUnviewedLowStockItems(data) {
-        console.log("🔍 Checking for low-stock items...");
-        const viewed = getViewedLowStockIds();
-        const lowStockItems = [];
-
-        data.forEach(product => {
-            const isNowLowStock = product.status === 2 || product.status === 1;
-
-            if (isNowLowStock && !viewed.has(product.id.toString())) {
-                lowStockItems.push(product);
-            }
-        });
-        return lowStockItems;
-    }
-
     // Shows a single modal listing all items passed to it
     function showLowStockAlert(itemsToShow) {
         if (!itemsToShow || itemsToShow.length === 0) {
@@ -210,9 +231,8 @@ $(document).ready(function () {
 
         // Update the "Mark as Viewed" button to handle all shown items
         $("#markViewedBtn").off("click").on("click", function () {
-            itemsToShow.forEach(product => {
-                markAsViewed(product.id);
-            });
+            acknowledgeAlerts(itemsToShow.map(product => product.id))
+                .catch(error => console.error("❌ Error acknowledging alerts:", error));
             modal.hide();
         });
     }
@@ -314,12 +334,34 @@ $(document).ready(function () {
          console.error("Bulk Delete button (#bulkDeleteInvBtn) not found!");
     }
 
-    $("#searchInput").on("keyup", function () {
-        let value = $(this).val().toLowerCase();
-        $("#tableBody tr").each(function () {
-            let rowText = $(this).text().toLowerCase();
-            $(this).toggle(rowText.includes(value));
-        });
+    // Search runs on the server (ranked, typo-tolerant); an empty box shows the synced list again
+    let searchQuery = "";
+    let searchTimer = null;
+
+    async function runSearch() {
+        const query = searchQuery;
+        try {
+            const response = await fetch(`${searchUrl}?q=${encodeURIComponent(query)}&limit=100`, { cache: "no-store" });
+            if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+            const data = await response.json();
+            // Ignore answers to a query the user has already typed past
+            if (query !== searchQuery) return;
+            updateTable(data.results);
+            updateSelectAllCheckboxState();
+        } catch (error) {
+            console.error("❌ Error searching inventory:", error);
+        }
+    }
+
+    $("#searchInput").on("input", function () {
+        searchQuery = $(this).val().trim();
+        clearTimeout(searchTimer);
+        if (!searchQuery) {
+            updateTable(currentInventoryData);
+            updateSelectAllCheckboxState();
+            return;
+        }
+        searchTimer = setTimeout(runSearch, 250);
     });
 
     // Updated Add Entry click handler
@@ -503,14 +545,91 @@ $(document).ready(function () {
         return cookieValue;
     }
 
-    // Initial fetch on page load - pass true to check for alerts
-    fetchInventoryData(true);
+    // Live updates: the server pushes inventory changes over Server-Sent Events. If the stream
+    // can't be opened (unsupported, or the server is at its stream limit) fall back to polling
+    // every 15 seconds and try the stream again later.
+    const eventsUrl = "/inventory/events/";
+    let pollTimer = null;
+
+    function startPolling() {
+        if (pollTimer) return;
+        // Pass false to prevent alert popups
+        pollTimer = setInterval(() => fetchInventoryData(false), 15000);
+        setTimeout(openInventoryStream, 60000);
+    }
 
-    // Set interval for background refresh - pass false to prevent alert popups
-    setInterval(() => fetchInventoryData(false), 15000);
+    function openInventoryStream() {
+        if (!window.EventSource) {
+            startPolling();
+            return;
+        }
+        // Later reconnects resume from the last event id automatically
+        const source = new EventSource(`${eventsUrl}?since=${syncToken || ""}`);
+        source.addEventListener("open", () => {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        });
+        source.addEventListener("inventory", event => {
+            const change = JSON.parse(event.data);
+            console.log("📡 Inventory change received:", change);
+            applyDelta({ items: change.items, deleted: change.deleted, token: event.lastEventId });
+            syncEtag = null;
+        });
+        source.addEventListener("error", () => {
+            // EventSource retries on its own unless the server refused the stream
+            if (source.readyState === EventSource.CLOSED) {
+                console.warn("⚠️ Inventory stream unavailable, polling instead.");
+                startPolling();
+            }
+        });
+    }
+
+    // Initial fetch on page load - pass true to check for alerts, then follow changes live
+    fetchInventoryData(true).then(openInventoryStream);
 
     // --- Tour Logic Removed ---
 
+    // Poll a background import job and report its result in the import modal
+    async function pollImportJob(statusUrl) {
+        try {
+            const response = await fetch(statusUrl);
+            if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+            const job = await response.json();
+
+            if (!job.done) {
+                $('#uploadBtn').html(`<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Importing... ${job.progress}%`);
+                setTimeout(() => pollImportJob(statusUrl), 1000);
+                return;
+            }
+
+            $('#uploadBtn').prop('disabled', false).text('Upload and Import');
+            if (job.status === 'COMPLETED') {
+                let message = job.message;
+                if (job.errors.length > 0) {
+                    message += ' ' + job.errors.join('; ');
+                }
+                importSuccess.removeClass('d-none').text(message);
+                importError.addClass('d-none');
+                importForm[0].reset();
+                
+                // Refresh inventory data
+                fetchInventoryData(false);
+                
+                // Close modal after 2 seconds
+                setTimeout(function() {
+                    $('#importModal').modal('hide');
+                }, 2000);
+            } else {
+                importError.removeClass('d-none').text(job.message || 'Unknown error occurred');
+                importSuccess.addClass('d-none');
+            }
+        } catch (error) {
+            $('#uploadBtn').prop('disabled', false).text('Upload and Import');
+            importError.removeClass('d-none').text('Error checking import status: ' + error.message);
+            importSuccess.addClass('d-none');
+        }
+    }
+
     // Handle import form submission
     if (importForm.length) {
         importForm.on('submit', function(e) {
@@ -547,21 +666,11 @@ $(document).ready(function () {
                 processData: false,
                 contentType: false,
                 success: function(response) {
-                    $('#uploadBtn').prop('disabled', false).text('Upload and Import');
-                    
                     if (response.success) {
-                        importSuccess.removeClass('d-none').text(response.message);
-                        importError.addClass('d-none');
-                        importForm[0].reset();
-                        
-                        // Refresh inventory data
-                        fetchInventoryData(false);
-                        
-                        // Close modal after 2 seconds
-                        setTimeout(function() {
-                            $('#importModal').modal('hide');
-                        }, 2000);
+                        // The import runs in the background; poll its status until it finishes
+                        pollImportJob(response.status_url);
                     } else {
+                        $('#uploadBtn').prop('disabled', false).text('Upload and Import');
                         importError.removeClass('d-none').text(response.error || 'Unknown error occurred');
                         importSuccess.addClass('d-none');
                     }
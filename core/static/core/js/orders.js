@@ -62,124 +62,30 @@ function toggleDetails(orderId) {
 }
 
 // Function: Filter Orders
-function filterOrders() {
+// Filtering, sorting and pagination happen on the server, so a filter change reloads the
+// page with the filter form as query parameters. Calls are debounced while typing.
+let filterTimer = null;
+function filterOrders(event) {
     console.log("filterOrders() triggered");
-
-    // Get filter values from the UI
-    const searchQuery = document.getElementById("searchInput").value.toLowerCase();
-    const statusFilter = document.getElementById("statusFilter").value.toLowerCase().trim();
-    const startDateValue = document.getElementById("startDate").value;
-    const endDateValue = document.getElementById("endDate").value;
-    
-    console.log(`Filter inputs - Search: "${searchQuery}", Status: "${statusFilter}", Start: "${startDateValue}", End: "${endDateValue}"`);
-    
-    // Select only rows that are order summaries, not details rows
-    const rows = document.querySelectorAll("tbody tr.order-row"); 
-
-    // Parse date range inputs once
-    let startDate = null;
-    let endDate = null;
-    
-    if (startDateValue) {
-        // Convert to UTC to avoid timezone issues
-        const [year, month, day] = startDateValue.split('-').map(Number);
-        startDate = new Date(Date.UTC(year, month - 1, day, 0, 0, 0));
-        console.log(`Start date: ${startDateValue} -> ${startDate.toISOString()}`);
-    }
-    
-    if (endDateValue) {
-        // Convert to UTC to avoid timezone issues
-        const [year, month, day] = endDateValue.split('-').map(Number);
-        endDate = new Date(Date.UTC(year, month - 1, day, 23, 59, 59));
-        console.log(`End date: ${endDateValue} -> ${endDate.toISOString()}`);
-    }
-
-    rows.forEach((row, idx) => {
-        // Get values from cells and data attributes
-        const orderNumber = row.cells[1].innerText.toLowerCase();
-        const supplierText = row.cells[2].innerText.toLowerCase();
-        const statusText = row.cells[5].innerText.toLowerCase().trim();
-        const productNames = row.dataset.products || "";
-        
-        // Extract date texts
-        const createdDateText = row.cells[3].innerText.trim();
-        const deliveryDateText = row.cells[4].innerText.trim();
-        
-        console.log(`Row ${idx} - Order: ${orderNumber}, Created: ${createdDateText}, Delivery: ${deliveryDateText}`);
-        
-        // Parse delivery date (primary date for filtering)
-        let deliveryDate = null;
-        if (deliveryDateText && deliveryDateText !== "N/A") {
-            const [month, day, year] = deliveryDateText.split('/').map(Number);
-            if (month && day && year) {
-                // Use UTC to avoid timezone issues
-                deliveryDate = new Date(Date.UTC(year, month - 1, day, 12, 0, 0));
-                console.log(`Row ${idx} - Parsed delivery date: ${deliveryDateText} -> ${deliveryDate.toISOString()}`);
-            }
-        }
-        
-        // Parse created date (fallback for filtering)
-        let createdDate = null;
-        if (createdDateText && createdDateText !== "N/A") {
-            const [month, day, year] = createdDateText.split('/').map(Number);
-            if (month && day && year) {
-                // Use UTC to avoid timezone issues
-                createdDate = new Date(Date.UTC(year, month - 1, day, 12, 0, 0));
-                console.log(`Row ${idx} - Parsed created date: ${createdDateText} -> ${createdDate.toISOString()}`);
-            }
-        }
-        
-        // --- Filtering Logic ---
-        
-        // DATE FILTER - prioritize delivery date, fall back to created date
-        let matchesDate = true;
-        
-        if (startDate || endDate) {
-            // Choose which date to filter against (prefer delivery date)
-            const dateToCheck = deliveryDate || createdDate;
-            
-            if (!dateToCheck) {
-                matchesDate = false;
-                console.log(`Row ${idx} - No valid date to check against filters`);
-            } else {
-                if (startDate && endDate) {
-                    matchesDate = dateToCheck >= startDate && dateToCheck <= endDate;
-                    console.log(`Row ${idx} - Date range check: ${dateToCheck.toISOString()} is between ${startDate.toISOString()} and ${endDate.toISOString()} = ${matchesDate}`);
-                } else if (startDate) {
-                    matchesDate = dateToCheck >= startDate;
-                    console.log(`Row ${idx} - Date after check: ${dateToCheck.toISOString()} >= ${startDate.toISOString()} = ${matchesDate}`);
-                } else if (endDate) {
-                    matchesDate = dateToCheck <= endDate;
-                    console.log(`Row ${idx} - Date before check: ${dateToCheck.toISOString()} <= ${endDate.toISOString()} = ${matchesDate}`);
-                }
-            }
+    clearTimeout(filterTimer);
+    const delay = event && event.type === "input" ? 400 : 0;
+    filterTimer = setTimeout(() => {
+        const params = new URLSearchParams(new FormData(document.getElementById("orderFilters")));
+        // Drop empty filters to keep the URL readable; a new filter starts at page 1
+        for (const [key, value] of Array.from(params.entries())) {
+            if (!value) params.delete(key);
         }
-        
-        // SEARCH FILTER
-        const matchesSearch = 
-            orderNumber.includes(searchQuery) || 
-            supplierText.includes(searchQuery) ||
-            productNames.includes(searchQuery);
-        
-        // STATUS FILTER
-        const matchesStatus = (statusFilter === "" || statusText === statusFilter);
-        
-        // COMBINE FILTERS
-        const finalMatch = matchesSearch && matchesStatus && matchesDate;
-        console.log(`Row ${idx} - Final match: search=${matchesSearch}, status=${matchesStatus}, date=${matchesDate} => ${finalMatch}`);
-        
-        // --- Set Row Visibility ---
-        const detailsRow = document.getElementById('details-' + row.querySelector('.order-checkbox').value);
-        
-        if (finalMatch) {
-            row.style.display = "";
-        } else {
-            row.style.display = "none";
-            if (detailsRow) {
-                detailsRow.style.display = "none";
-            }
-        }
-    });
+        window.location.search = params.toString();
+    }, delay);
+}
+
+// Function: Sort Orders by a column, toggling direction when it is already the sort column
+function sortOrders(field) {
+    const params = new URLSearchParams(window.location.search);
+    const current = params.get("sort") || "-date_ordered";
+    params.set("sort", current === field ? `-${field}` : field);
+    params.delete("page");
+    window.location.search = params.toString();
 }
 
 // Function to manage enabling/disabling the first item row's remove button
@@ -350,6 +256,11 @@ document.addEventListener("DOMContentLoaded", function() {
     document.getElementById("statusFilter").addEventListener("change", filterOrders);
     document.getElementById("startDate").addEventListener("change", filterOrders);
     document.getElementById("endDate").addEventListener("change", filterOrders);
+    document.getElementById("supplierFilter").addEventListener("change", filterOrders);
+    document.getElementById("orderFilters").addEventListener("submit", function(event) {
+        event.preventDefault();
+        filterOrders();
+    });
 
     // --- New Order Modal Logic ---
     const orderForm = document.getElementById("orderForm");
@@ -637,11 +548,13 @@ document.addEventListener("DOMContentLoaded", function() {
         });
     });
     
-    // Add event listeners for filter inputs (replacing inline event handlers)
-    document.getElementById('searchInput').addEventListener('input', filterOrders);
-    document.getElementById('statusFilter').addEventListener('change', filterOrders);
-    document.getElementById('startDate').addEventListener('change', filterOrders);
-    document.getElementById('endDate').addEventListener('change', filterOrders);
+    // Add event listeners for sortable column headers
+    document.querySelectorAll('.sort-link').forEach(link => {
+        link.addEventListener('click', function(event) {
+            event.preventDefault();
+            sortOrders(this.getAttribute('data-sort'));
+        });
+    });
     
     // --- Tour Logic Removed ---
 
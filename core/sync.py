@@ -0,0 +1,69 @@
+# core/sync.py
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Max
+
+from .models import InventoryItem, InventoryItemDeletion, InventoryVersion
+
+# Rows saved shortly before a sync token was issued may commit after it, so every delta
+# request re-reads this much history. Clients apply deltas idempotently by id.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_sync_token(moment):
+    """Encode a datetime as a sync token (integer microseconds since the epoch)."""
+    delta = moment - EPOCH
+    return str(delta.days * 86400 * 10**6 + delta.seconds * 10**6 + delta.microseconds)
+
+
+def decode_sync_token(token):
+    """Decode a sync token into a datetime. Raises ValueError if invalid."""
+    micros = int(token)
+    if micros < 0:
+        raise ValueError("Invalid sync token.")
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def inventory_validator():
+    """
+    Return (inventory version, latest date_modified, row count). The version is bumped after every
+    committed inventory change, including one that commits after SYNC_OVERLAP with an older
+    date_modified, which leaves max(date_modified) and the count as they were.
+    """
+    stats = InventoryItem.objects.aggregate(latest=Max('date_modified'), count=Count('id'))
+    return InventoryVersion.current(), stats['latest'], stats['count']
+
+
+def inventory_etag(request, *args, **kwargs):
+    """
+    ETag for the inventory list API, including delta requests. Any committed change, insert or
+    deletion bumps the inventory version; the query string is part of the tag since it selects
+    the representation.
+    """
+    version, latest, count = inventory_validator()
+    raw = f"{version}|{latest.isoformat() if latest else ''}|{count}|{request.GET.urlencode()}"
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def inventory_delta(since, fields):
+    """
+    Return (changed rows, deleted ids, next token) for items modified or deleted since the given datetime.
+    A token of the epoch means a full sync, so no deletions are reported.
+    """
+    window = since - SYNC_OVERLAP
+    changed = list(InventoryItem.objects.filter(date_modified__gte=window).order_by('name', 'id').values(*fields, 'date_modified'))
+    if since <= EPOCH:
+        deleted = []
+    else:
+        deleted = list(InventoryItemDeletion.objects.filter(date_deleted__gte=window).values('item_id', 'date_deleted'))
+
+    # The next token is the newest change seen, so an unchanged inventory keeps the same URL and ETag
+    latest = since
+    for row in changed:
+        latest = max(latest, row.pop('date_modified'))
+    for row in deleted:
+        latest = max(latest, row['date_deleted'])
+    return changed, sorted({row['item_id'] for row in deleted}), encode_sync_token(latest)
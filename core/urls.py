@@ -5,8 +5,12 @@ from .views import (login_page, signup_page, dashboard_view, invmanagement_view,
     bulk_delete_orders, bulk_update_order_status,
     bulk_delete_inventory_items,
     import_products,
+    import_job_status,
     download_template,
-    get_inventory_items,
+    get_inventory_items, search_inventory_items, inventory_stock_at, inventory_events,
+    inventory_alerts, acknowledge_inventory_alerts,
+    metrics_view,
+    export_inventory, export_inventory_changes, export_orders, export_suppliers,
     update_inventory_item,
     logout_page)
 
@@ -39,10 +43,23 @@ urlpatterns = [
     path('orders/bulk_update_status/', bulk_update_order_status, name='bulk_update_order_status'),
     path('inventory/bulk_delete/', bulk_delete_inventory_items, name='bulk_delete_inventory_items'),
     path('import-products/', import_products, name='import_products'),
+    path('import-products/jobs/<int:job_id>/', import_job_status, name='import_job_status'),
     path('download-template/', download_template, name='download_template'),
+    path('exports/inventory/', export_inventory, name='export_inventory'),
+    path('exports/inventory-changes/', export_inventory_changes, name='export_inventory_changes'),
+    path('exports/orders/', export_orders, name='export_orders'),
+    path('exports/suppliers/', export_suppliers, name='export_suppliers'),
     path('api/v1/items/', get_inventory_items, name='get_inventory_items'),
+    # /api/v1/items/ is served by the DRF router first, so the inventory page uses this path
+    path('inventory/items/', get_inventory_items, name='inventory_items'),
+    path('inventory/search/', search_inventory_items, name='search_inventory_items'),
+    path('inventory/stock-at/', inventory_stock_at, name='inventory_stock_at'),
+    path('inventory/events/', inventory_events, name='inventory_events'),
+    path('inventory/alerts/', inventory_alerts, name='inventory_alerts'),
+    path('inventory/alerts/acknowledge/', acknowledge_inventory_alerts, name='acknowledge_inventory_alerts'),
     path('api/v1/items/add/', add_inventory_item, name='add_inventory_item'),
     path('api/v1/items/<int:item_id>/delete/', delete_inventory_item, name='delete_inventory_item'),
     path('logout.html', logout_page, name='logout_page'),
+    path('metrics', metrics_view, name='metrics'),
 
 ]
\ No newline at end of file
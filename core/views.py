@@ -1,26 +1,42 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth import login, logout, get_user_model, update_session_auth_hash
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponseForbidden, HttpResponse
-from django.views.decorators.http import require_POST, require_http_methods
+from django.http import JsonResponse, HttpResponseForbidden, HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_POST, require_http_methods, condition
 from django.views.decorators.csrf import csrf_exempt
 from core.models import Profile
 import json
-import uuid
 from .decorators import allowed_roles
 from .roles import ROLE_SETTINGS_ACCESS, ROLE_INVENTORY_ACCESS, ROLE_ORDERS_ACCESS, ROLE_SUPPLIERS_ACCESS, ROLE_REPORTS_ACCESS
 from .forms import SignUpForm  # Import the fixed signup form
-from .models import Order, Supplier, Profile, InventoryItem, InventoryItem, OrderItem
+from .pagination import keyset_page, parse_limit
+from .sync import decode_sync_token, inventory_delta, inventory_etag
+from .events import InventoryStream, acquire_stream_slot, inventory_event_stream
+from .metrics import registry as metrics_registry
+from .exports import EXPORT_FORMATS, export_queryset, stream_rows
+from .jobs import enqueue_import_job
+from .dashboard import get_dashboard_snapshot
+from .alerts import acknowledge_alerts, open_alerts
+from .search import search_inventory
+from .ledger import catalogue_stock_at, stock_at
+from .list_cache import cached_list
+from .orders import update_order_status, clean_order_payload, load_suppliers, create_orders, OrderValidationError
+from .models import Order, Supplier, Profile, InventoryItem, InventoryItem, OrderItem, ImportJob
 import logging
 from django.db import transaction, IntegrityError
-from django.db.models import Count, Q # Import Q for complex lookups
+from django.db.models import Q, Prefetch # Import Q for complex lookups
+from django.core.paginator import Paginator
+from django.conf import settings
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 import pandas as pd
 import io
-import codecs
-import csv
 
 # Get an instance of a logger
 # logger = logging.getLogger(__name__) # Removing logger for simplification
@@ -59,78 +75,51 @@ def signup_page(request):
 @login_required
 @allowed_roles(roles=ROLE_ORDERS_ACCESS)
 def save_order(request):
+    """
+    Create an order from {'supplier', 'expectedDelivery', 'items'}, or many orders at once from
+    {'orders': [...]} (batch mode). The whole payload is validated before anything is written,
+    and all orders and items are created in one transaction.
+    """
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
-            
-            supplier_id = data.get('supplier')
-            expected_delivery = data.get('expectedDelivery')
-            items_data = data.get('items') # Expecting a list of items
-
-            # --- Basic Validation --- 
-            if not supplier_id:
-                return JsonResponse({'success': False, 'error': 'Supplier is required.'}, status=400)
-            if not items_data or not isinstance(items_data, list) or len(items_data) == 0:
-                 return JsonResponse({'success': False, 'error': 'Order must contain at least one item.'}, status=400)
-
-            # --- Get Supplier --- 
-            try:
-                supplier = Supplier.objects.get(id=supplier_id)
-            except Supplier.DoesNotExist:
-                return JsonResponse({'success': False, 'error': 'Supplier not found.'}, status=404)
-            
-            # --- Generate Order Number --- 
-            order_number = str(uuid.uuid4())[:8] # Consider making this check for uniqueness in a loop if collisions are likely
-
-            # --- Create the Main Order --- 
-            # Status defaults to PENDING as defined in the model
-            order = Order.objects.create(
-                order_number=order_number,
-                supplier=supplier,
-                expected_delivery=expected_delivery 
-                # Removed product, quantity. Status defaults to PENDING.
-            )
-
-            # --- Create Order Items --- 
-            order_items_to_create = []
-            for item_data in items_data:
-                product_name = item_data.get('product_name')
-                quantity_str = item_data.get('quantity')
-                
-                # Validate item data
-                if not product_name:
-                    # If an item is invalid, we should ideally roll back the order creation or handle it.
-                    # For simplicity now, we'll return an error, but this leaves an empty order behind.
-                    # A database transaction would be better here in a production scenario.
-                     return JsonResponse({'success': False, 'error': 'All items must have a product name.'}, status=400)
+            batch = isinstance(data, dict) and 'orders' in data
+            payloads = data.get('orders') if batch else [data]
+            if not isinstance(payloads, list) or len(payloads) == 0:
+                return JsonResponse({'success': False, 'error': 'orders must be a non-empty list.'}, status=400)
+
+            # --- Validate everything up front --- 
+            suppliers = load_suppliers([p for p in payloads if isinstance(p, dict)])
+            cleaned_orders = []
+            errors = []
+            for index, payload in enumerate(payloads):
                 try:
-                    quantity = int(quantity_str)
-                    if quantity <= 0:
-                        raise ValueError("Quantity must be positive")
-                except (ValueError, TypeError):
-                    return JsonResponse({'success': False, 'error': f'Invalid quantity for product "{product_name}". Must be a positive whole number.'}, status=400)
-
-                # Add valid item to list for bulk creation
-                order_items_to_create.append(
-                    OrderItem(order=order, product_name=product_name, quantity=quantity)
-                )
-            
-            # Create all items in one go if the list is not empty
-            if order_items_to_create:
-                OrderItem.objects.bulk_create(order_items_to_create)
-            else:
-                # This case should ideally be caught earlier, but as a safeguard:
-                order.delete() # Clean up the empty order if no valid items were processed
-                return JsonResponse({'success': False, 'error': 'No valid items found in the order.'}, status=400)
+                    cleaned_orders.append(clean_order_payload(payload, suppliers))
+                except OrderValidationError as e:
+                    errors.append({'index': index, 'error': str(e), 'status': e.status})
+            if errors:
+                if not batch:
+                    return JsonResponse({'success': False, 'error': errors[0]['error']}, status=errors[0]['status'])
+                return JsonResponse({
+                    'success': False,
+                    'error': f'{len(errors)} order(s) are invalid. No orders were saved.',
+                    'errors': [{'index': e['index'], 'error': e['error']} for e in errors],
+                }, status=400)
 
-            # Query for an updated supplier list (optional, might not be needed anymore)
-            suppliers = list(Supplier.objects.all().values('id', 'name'))
+            # --- Create orders and items in one transaction --- 
+            orders = create_orders(cleaned_orders)
 
+            if batch:
+                return JsonResponse({
+                    'success': True,
+                    'message': f'{len(orders)} order(s) saved successfully',
+                    'orders': [{'order_id': order.id, 'order_number': order.order_number} for order in orders],
+                })
             return JsonResponse({
                 'success': True,
                 'message': 'Order saved successfully',
-                'order_id': order.id, # Optionally return the new order ID
-                'suppliers': suppliers 
+                'order_id': orders[0].id,
+                'order_number': orders[0].order_number,
             })
         
         except json.JSONDecodeError:
@@ -145,8 +134,8 @@ def save_order(request):
 @login_required
 @allowed_roles(roles=ROLE_ORDERS_ACCESS)
 def get_suppliers(request):
-    suppliers = Supplier.objects.all().values('id', 'name')
-    return JsonResponse({'suppliers': list(suppliers)})
+    suppliers = cached_list(request, 'supplier-options', (Supplier,), lambda: list(Supplier.objects.all().values('id', 'name')))
+    return JsonResponse({'suppliers': suppliers})
 
 
 @csrf_exempt
@@ -171,35 +160,16 @@ def update_order(request, order_id):
         if new_status not in valid_statuses:
             return JsonResponse({'success': False, 'error': f'Invalid status: {new_status}'}, status=400)
 
-        previous_status = order.status
-        order.status = new_status
-        order.save()
-
-        # --- Update Inventory on Completion --- 
-        if previous_status == 'PENDING' and new_status == 'COMPLETED':
-            try:
-                # Iterate over the items associated with this order
-                for item in order.items.all(): 
-                    # Find or create the inventory item based on the product name from the order item
-                    inventory_item, created = InventoryItem.objects.get_or_create(
-                        name=item.product_name, # Use product_name from OrderItem
-                        defaults={'quantity': 0, 'threshold': 0} # Removed description field
-                    )
-                    # Increment the inventory quantity
-                    inventory_item.quantity += item.quantity # Use quantity from OrderItem
-                    inventory_item.save() # This recalculates inventory status via the model's save() method
-                
-                # Optional: Log successful inventory update
-                # logger.info(f"Inventory updated successfully for completed order {order.order_number} (ID: {order_id})")
-
-            except Exception as e:
-                # Log the error
-                # logger.exception(f"Error updating inventory for completed order {order.order_number} (ID: {order_id}):")
-                # Inform the user, but the order status is already updated.
-                # Consider how to handle partial inventory update failures.
-                messages.warning(request, f"Order status updated to COMPLETED, but there was an issue updating inventory: {str(e)}")
-                # Return success=True because the order *status* was updated, but maybe add a warning message
-                return JsonResponse({'success': True, 'message': 'Order updated, but inventory update failed.'})
+        # Status change and inventory posting go through the same engine as bulk updates
+        try:
+            updated_count, inventory_errors = update_order_status([order.id], new_status, user=request.user)
+        except Exception as e:
+            # logger.exception(f"Error updating order {order.order_number} (ID: {order_id}):")
+            return JsonResponse({'success': False, 'error': f'Error updating order: {str(e)}'}, status=500)
+
+        if inventory_errors:
+            messages.warning(request, "Order status updated to COMPLETED, but there was an issue updating inventory: " + "; ".join(inventory_errors))
+            return JsonResponse({'success': True, 'message': 'Order updated, but inventory update failed.'})
 
         return JsonResponse({'success': True, 'message': 'Order updated successfully'})
 
@@ -441,13 +411,28 @@ def delete_inventory_item(request, item_id):
 @require_POST
 @login_required
 def mark_alert_viewed(request, item_id):
-    try:
-        item = InventoryItem.objects.get(id=item_id)
-        item.alert_triggered = True
-        item.save()
-        return JsonResponse({"success": True})
-    except InventoryItem.DoesNotExist:
+    if not InventoryItem.objects.filter(id=item_id).exists():
         return JsonResponse({"error": "Item not found"}, status=404)
+    acknowledge_alerts(request.user, [item_id])
+    return JsonResponse({"success": True})
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def inventory_alerts(request):
+    """Open low/out-of-stock alerts the current user hasn't acknowledged yet."""
+    return JsonResponse({'alerts': open_alerts(user=request.user)})
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+@require_POST
+def acknowledge_inventory_alerts(request):
+    """Acknowledge the open alerts of the items in {"items": [id, ...]} for the current user."""
+    try:
+        item_ids = [int(item_id) for item_id in json.loads(request.body).get('items', [])]
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Expected {"items": [item ids]}.'}, status=400)
+    acknowledged = acknowledge_alerts(request.user, item_ids)
+    return JsonResponse({'success': True, 'acknowledged': acknowledged})
 
 @csrf_exempt
 @require_http_methods(["PUT"])
@@ -522,56 +507,22 @@ def settings_view(request):
 
 @login_required
 def dashboard_view(request):
-    # Calculate KPI counts
-    total_products = InventoryItem.objects.count()
-    # Count items that are Low Stock (2) or Out of Stock (1)
-    stock_alerts = InventoryItem.objects.filter(Q(status=1) | Q(status=2)).count()
-    pending_orders = Order.objects.filter(status='PENDING').count()
-    total_suppliers = Supplier.objects.count() # Added supplier count
-    
-    # Fetch recent orders (e.g., last 5)
-    recent_orders = Order.objects.order_by('-date_ordered')[:5]
-    
-    # Fetch recent suppliers (last 5)
-    recent_suppliers = Supplier.objects.order_by('-date_added')[:5]
-    
-    # Fetch low/out-of-stock items
-    low_stock_items = InventoryItem.objects.filter(Q(status=1) | Q(status=2)).order_by('status', 'name')
-    
-    # Prepare data for Inventory Status Pie Chart
-    inventory_status_counts = InventoryItem.objects.values('status').annotate(count=Count('id')).order_by('status')
-    # Convert status codes to labels for the chart
-    chart_labels = []
-    chart_data = []
-    status_map = dict(InventoryItem.INV_STATUS_CHOICES) # Use choices from model
-    for item in inventory_status_counts:
-        chart_labels.append(status_map.get(item['status'], 'Unknown'))
-        chart_data.append(item['count'])
-        
-    # Prepare data for Suppliers Status chart
-    active_suppliers = Supplier.objects.filter(status=True).count()
-    inactive_suppliers = Supplier.objects.filter(status=False).count()
-    suppliers_chart_labels = ["Active", "Inactive"]
-    suppliers_chart_data = [active_suppliers, inactive_suppliers]
-    
-    # Get top suppliers by order count
-    top_suppliers = Supplier.objects.annotate(
-        order_count=Count('orders')
-    ).order_by('-order_count')[:5]
+    # KPI counts, chart data and short lists come from one cached snapshot
+    snapshot = get_dashboard_snapshot()
 
     context = {
-        'total_products': total_products,
-        'stock_alerts': stock_alerts,
-        'pending_orders': pending_orders,
-        'total_suppliers': total_suppliers, # Added to context
-        'recent_orders': recent_orders,
-        'recent_suppliers': recent_suppliers, # Added recent suppliers
-        'top_suppliers': top_suppliers, # Added top suppliers
-        'low_stock_items': low_stock_items,
-        'inventory_chart_labels': json.dumps(chart_labels), # Pass as JSON for JS
-        'inventory_chart_data': json.dumps(chart_data),   # Pass as JSON for JS
-        'suppliers_chart_labels': json.dumps(suppliers_chart_labels), # Pass as JSON for JS
-        'suppliers_chart_data': json.dumps(suppliers_chart_data),   # Pass as JSON for JS
+        'total_products': snapshot['total_products'],
+        'stock_alerts': snapshot['stock_alerts'],
+        'pending_orders': snapshot['pending_orders'],
+        'total_suppliers': snapshot['total_suppliers'],
+        'recent_orders': snapshot['recent_orders'],
+        'recent_suppliers': snapshot['recent_suppliers'],
+        'top_suppliers': snapshot['top_suppliers'],
+        'low_stock_items': snapshot['low_stock_items'],
+        'inventory_chart_labels': json.dumps(snapshot['inventory_chart_labels']), # Pass as JSON for JS
+        'inventory_chart_data': json.dumps(snapshot['inventory_chart_data']),   # Pass as JSON for JS
+        'suppliers_chart_labels': json.dumps(["Active", "Inactive"]), # Pass as JSON for JS
+        'suppliers_chart_data': json.dumps([snapshot['active_suppliers'], snapshot['inactive_suppliers']]),   # Pass as JSON for JS
     }
     return render(request, 'dashboard.html', context)
 
@@ -579,11 +530,84 @@ def dashboard_view(request):
 def invmanagement_view(request):
     return render(request, 'invmanagement.html')
 
+# Page size and sortable columns of the orders page
+ORDERS_PAGE_SIZE = 50
+ORDER_SORT_FIELDS = {
+    'order_number': 'order_number',
+    'supplier': 'supplier__name',
+    'date_ordered': 'date_ordered',
+    'expected_delivery': 'expected_delivery',
+    'status': 'status',
+}
+
 @login_required
 @allowed_roles(roles=ROLE_ORDERS_ACCESS)
 def orders_view(request):
-    orders = Order.objects.all().order_by('-date_ordered')
-    return render(request, 'orders.html', {'orders': orders})
+    """
+    Orders page, filtered, sorted and paginated on the server. Query parameters: q (order number,
+    supplier or product), status, supplier (id), start/end (order date, YYYY-MM-DD), sort
+    (a key of ORDER_SORT_FIELDS, '-' prefix for descending) and page.
+    """
+    orders = Order.objects.select_related('supplier').prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.only('id', 'order_id', 'product_name', 'quantity').order_by('id'))
+    )
+
+    filters = {key: request.GET.get(key, '').strip() for key in ('q', 'status', 'supplier', 'start', 'end')}
+    if filters['q']:
+        search = filters['q']
+        # Product matches go through a subquery so orders aren't duplicated by the join
+        orders = orders.filter(
+            Q(order_number__icontains=search) |
+            Q(supplier__name__icontains=search) |
+            Q(pk__in=OrderItem.objects.filter(product_name__icontains=search).values('order_id'))
+        )
+    if filters['status'] in dict(Order.ORDER_STATUS):
+        orders = orders.filter(status=filters['status'])
+    if filters['supplier'].isdigit():
+        orders = orders.filter(supplier_id=int(filters['supplier']))
+    try:
+        start = parse_date(filters['start']) if filters['start'] else None
+    except ValueError:  # well formed but impossible, e.g. 2024-13-45; ignored like other bad filters
+        start = None
+    try:
+        end = parse_date(filters['end']) if filters['end'] else None
+    except ValueError:
+        end = None
+    # Day bounds in the current time zone, compared with the column itself so the date_ordered
+    # indexes can serve the filter
+    try:
+        if start:
+            orders = orders.filter(date_ordered__gte=timezone.make_aware(datetime.combine(start, time.min)))
+        if end:
+            orders = orders.filter(date_ordered__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)))
+    except OverflowError:  # bounds at the ends of the calendar exclude nothing
+        pass
+
+    sort = request.GET.get('sort', '-date_ordered')
+    sort_key = sort.lstrip('-')
+    if sort_key not in ORDER_SORT_FIELDS:
+        sort, sort_key = '-date_ordered', 'date_ordered'
+    prefix = '-' if sort.startswith('-') else ''
+    orders = orders.order_by(prefix + ORDER_SORT_FIELDS[sort_key], prefix + 'id')
+
+    page = Paginator(orders, ORDERS_PAGE_SIZE).get_page(request.GET.get('page'))
+    for order in page:
+        # Searchable product list for the row, built from the prefetched items
+        order.product_names = ", ".join(item.product_name for item in order.items.all()).lower()
+
+    # Query string without the page number, for the pagination links
+    params = request.GET.copy()
+    params.pop('page', None)
+
+    return render(request, 'orders.html', {
+        'orders': page,
+        'page_obj': page,
+        'filters': filters,
+        'sort': sort,
+        'order_statuses': Order.ORDER_STATUS,
+        'supplier_choices': Supplier.objects.order_by('name').values('id', 'name'),
+        'query_string': params.urlencode(),
+    })
 
 @login_required
 @allowed_roles(roles=ROLE_SUPPLIERS_ACCESS)
@@ -675,43 +699,9 @@ def bulk_update_order_status(request):
         if not valid_ids:
              return JsonResponse({'success': False, 'error': 'No valid order IDs provided.'}, status=400)
 
-        updated_count = 0
-        inventory_errors = []
-
-        # Use a transaction to ensure atomicity
-        with transaction.atomic():
-            # Fetch the orders to be updated
-            orders_to_update = Order.objects.select_for_update().filter(pk__in=valid_ids) 
-            # select_for_update locks the rows
-
-            for order in orders_to_update:
-                previous_status = order.status
-                
-                # Skip if status is already the target status
-                if previous_status == new_status:
-                    continue
-
-                order.status = new_status
-                order.save() # Save the status change first
-                updated_count += 1
-                
-                # --- Trigger Inventory Update Logic --- 
-                if previous_status == 'PENDING' and new_status == 'COMPLETED':
-                    try:
-                        for item in order.items.all(): 
-                            inventory_item, created = InventoryItem.objects.get_or_create(
-                                name=item.product_name,
-                                defaults={'quantity': 0, 'threshold': 0}
-                            )
-                            inventory_item.quantity += item.quantity
-                            inventory_item.save() 
-                    except Exception as e:
-                        # Log the specific inventory error but continue processing other orders
-                        # logger.exception(f"Inventory update failed for order {order.order_number} item {item.product_name}: {str(e)}")
-                        inventory_errors.append(f"Order {order.order_number}: {str(e)}")
-                        # Note: Depending on requirements, you might want to fail the entire transaction here
-                        # by raising the exception instead of appending to inventory_errors.
-                        # raise e # Uncomment this to make the whole bulk operation fail if one inventory update fails
+        # Statuses are set in one UPDATE and completed orders are posted to inventory
+        # with quantities aggregated per product, all in one transaction
+        updated_count, inventory_errors = update_order_status(valid_ids, new_status, user=request.user)
         
         # --- Prepare response message --- 
         message = f'{updated_count} order(s) status updated to {new_status}.'
@@ -774,186 +764,35 @@ def bulk_delete_inventory_items(request):
 def import_products(request):
     if request.method == 'POST':
         try:
-            # Print debug info about the request
-            print("Import products request received")
-            print(f"FILES: {request.FILES}")
-            print(f"POST: {request.POST}")
-            
             excel_file = request.FILES.get('excel_file')
             if not excel_file:
-                print("No file found in request")
                 return JsonResponse({
                     'success': False,
                     'error': 'Please select a file to upload'
                 })
-                
-            print(f"File received: {excel_file.name}, size: {excel_file.size} bytes")
-                
+
             if not excel_file.name.endswith('.csv'):
                 return JsonResponse({
                     'success': False,
                     'error': 'Invalid file format. Please upload a CSV file (.csv)'
                 })
 
-            # Read the CSV file
-            try:
-                # First try with pandas
-                try:
-                    df = pd.read_csv(excel_file)
-                    print(f"DataFrame created successfully with {len(df)} rows")
-                    print(f"DataFrame head:\n{df.head()}")
-                    print(f"DataFrame columns: {df.columns.tolist()}")
-                except Exception as e:
-                    print(f"Error with pandas: {str(e)}")
-                    # If pandas fails, try with builtin csv module
-                    excel_file.seek(0)  # Reset file pointer
-                    import csv
-                    reader = csv.DictReader(codecs.iterdecode(excel_file, 'utf-8'))
-                    data = list(reader)
-                    if not data:
-                        raise Exception("No data found in CSV")
-                    
-                    # Convert to DataFrame
-                    df = pd.DataFrame(data)
-                    print(f"Created DataFrame from CSV module with {len(df)} rows")
-            except Exception as e:
-                print(f"Error reading CSV file: {str(e)}")
-                return JsonResponse({
-                    'success': False,
-                    'error': f'Error reading CSV file: {str(e)}. Please make sure the file is not corrupted and is a valid CSV file.'
-                })
-
-            if df.empty:
-                print("DataFrame is empty")
-                return JsonResponse({
-                    'success': False,
-                    'error': 'The CSV file is empty. Please add some data.'
-                })
+            # Hand the file to the background worker and return the job id right away
+            job = ImportJob.objects.create(
+                file_name=excel_file.name,
+                data=excel_file.read(),
+                created_by=request.user,
+            )
+            transaction.on_commit(lambda: enqueue_import_job(job))
 
-            # Convert all column names to lowercase for easier matching
-            df.columns = df.columns.str.lower().str.strip()
-            
-            # Define possible variations for each required field
-            name_variations = ['name', 'product', 'item', 'product name', 'item name', 'productname', 'itemname', 'title', 'description']
-            quantity_variations = ['quantity', 'qty', 'amount', 'stock', 'count', 'number', 'total', 'inventory']
-            threshold_variations = ['threshold', 'minimum', 'min', 'reorder', 'reorder point', 'minimum stock', 'min stock', 'reorder level']
-
-            # Find the best matching columns
-            name_col = None
-            quantity_col = None
-            threshold_col = None
-
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                # Try to match name column
-                if not name_col and any(variation in col_lower for variation in name_variations):
-                    name_col = col
-                # Try to match quantity column
-                elif not quantity_col and any(variation in col_lower for variation in quantity_variations):
-                    quantity_col = col
-                # Try to match threshold column
-                elif not threshold_col and any(variation in col_lower for variation in threshold_variations):
-                    threshold_col = col
-
-            # If we still don't have matches, try to use positional matching as fallback
-            if not name_col and len(df.columns) >= 1:
-                name_col = df.columns[0]  # First column is usually the name
-            if not quantity_col and len(df.columns) >= 2:
-                quantity_col = df.columns[1]  # Second column is usually quantity
-            if not threshold_col and len(df.columns) >= 3:
-                threshold_col = df.columns[2]  # Third column could be threshold
-
-            print(f"Mapped columns: Name={name_col}, Quantity={quantity_col}, Threshold={threshold_col}")
-            
-            # Process each row
-            success_count = 0
-            error_count = 0
-            errors = []
-            
-            # Skip empty rows
-            df = df.dropna(how='all')
-            
-            for index, row in df.iterrows():
-                try:
-                    # Get and validate name
-                    if name_col is None:
-                        print(f"Row {index + 1}: Missing name column")
-                        error_count += 1
-                        continue
-                        
-                    name = str(row[name_col]).strip() if not pd.isna(row[name_col]) else None
-                    if not name or pd.isna(name) or (index == 0 and name.lower() == name_col.lower()):
-                        print(f"Row {index + 1}: Skipping header or empty name: {name}")
-                        continue
-
-                    # Get and validate quantity and threshold
-                    try:
-                        # Handle quantity
-                        quantity = row[quantity_col] if quantity_col and not pd.isna(row[quantity_col]) else 0
-                        if pd.isna(quantity):
-                            quantity = 0
-                        if isinstance(quantity, str):
-                            quantity = quantity.replace(',', '').strip()
-                        quantity = int(float(quantity))
-                        if quantity < 0:
-                            quantity = 0
-
-                        # Handle threshold
-                        threshold = row[threshold_col] if threshold_col and not pd.isna(row[threshold_col]) else 0
-                        if pd.isna(threshold):
-                            threshold = 0
-                        if isinstance(threshold, str):
-                            threshold = threshold.replace(',', '').strip()
-                        threshold = int(float(threshold))
-                        if threshold < 0:
-                            threshold = 0
-                            
-                    except (ValueError, TypeError) as e:
-                        print(f"Row {index + 1}: Error with quantity/threshold: {str(e)}")
-                        # If there's an error with quantity or threshold, set them to 0
-                        quantity = 0
-                        threshold = 0
-
-                    print(f"Processing row {index + 1}: Name='{name}', Quantity={quantity}, Threshold={threshold}")  # Debug log
-
-                    # Create or update inventory item
-                    try:
-                        print(f"Attempting to save item to database: {name}, qty={quantity}, threshold={threshold}")
-                        item, created = InventoryItem.objects.update_or_create(
-                            name=name,
-                            defaults={
-                                'quantity': quantity,
-                                'threshold': threshold
-                            }
-                        )
-                        print(f"Database operation completed. Item ID: {item.id}, Created: {created}")
-                        success_count += 1
-                        print(f"Row {index + 1}: {'Created' if created else 'Updated'} item {name}")
-                    except Exception as db_error:
-                        print(f"DATABASE ERROR saving item {name}: {str(db_error)}")
-                        error_count += 1
-                        errors.append(f"Database error with {name}: {str(db_error)}")
-                        continue
-
-                except Exception as e:
-                    error_count += 1
-                    error_msg = f"Row {index + 1}: {str(e)}"
-                    print(f"Error: {error_msg}")  # Debug log
-                    errors.append(error_msg)
-                    continue
-
-            message = f'Successfully imported {success_count} products.'
-            if error_count > 0:
-                message += f' {error_count} items were skipped.'
-            
-            print(f"Import completed: {success_count} successes, {error_count} errors")
             return JsonResponse({
                 'success': True,
-                'message': message
-            })
+                'message': 'Import started.',
+                'job_id': job.id,
+                'status_url': reverse('import_job_status', args=[job.id]),
+            }, status=202)
             
         except Exception as e:
-            print(f"General error during import: {str(e)}")
             return JsonResponse({
                 'success': False,
                 'error': f'Error processing file: {str(e)}'
@@ -964,6 +803,25 @@ def import_products(request):
         'error': 'Invalid request method'
     }, status=405)
 
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def import_job_status(request, job_id):
+    """API endpoint to poll the progress of a background product import"""
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return JsonResponse({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'done': job.status in (ImportJob.COMPLETED, ImportJob.FAILED),
+        'progress': job.progress(),
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'created': job.created_count,
+        'updated': job.updated_count,
+        'errors': job.errors,
+        'message': job.message,
+    })
+
 @login_required
 @allowed_roles(roles=ROLE_INVENTORY_ACCESS)
 def download_template(request):
@@ -987,21 +845,210 @@ def download_template(request):
     
     return response
 
+def _export_response(request, dataset):
+    """
+    Stream a dataset export (see core.exports). Query parameters: format (csv or jsonl, default
+    csv) and start/end (YYYY-MM-DD, inclusive) on the dataset's date column.
+    """
+    output_format = request.GET.get('format', 'csv')
+    if output_format not in EXPORT_FORMATS:
+        return JsonResponse({'success': False, 'error': 'format must be csv or jsonl.'}, status=400)
+    try:
+        start = parse_date(request.GET['start']) if request.GET.get('start') else None
+        end = parse_date(request.GET['end']) if request.GET.get('end') else None
+    except ValueError:
+        start = end = None
+    if (request.GET.get('start') and start is None) or (request.GET.get('end') and end is None):
+        return JsonResponse({'success': False, 'error': 'start and end must be dates (YYYY-MM-DD).'}, status=400)
+
+    rows, formatter = export_queryset(dataset, start, end)
+    response = StreamingHttpResponse(stream_rows(rows, output_format, formatter), content_type=EXPORT_FORMATS[output_format])
+    response['Content-Disposition'] = f'attachment; filename={dataset}-{timezone.now():%Y%m%d}.{output_format}'
+    return response
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def export_inventory(request):
+    return _export_response(request, 'inventory')
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def export_inventory_changes(request):
+    return _export_response(request, 'inventory_changes')
+
+@login_required
+@allowed_roles(roles=ROLE_ORDERS_ACCESS)
+def export_orders(request):
+    return _export_response(request, 'orders')
+
+@login_required
+@allowed_roles(roles=ROLE_SUPPLIERS_ACCESS)
+def export_suppliers(request):
+    return _export_response(request, 'suppliers')
+
+# Columns returned by the inventory list API, and the columns it may be sorted on
+INVENTORY_LIST_FIELDS = ('id', 'name', 'quantity', 'threshold', 'status')
+INVENTORY_SORT_FIELDS = ('name', 'quantity', 'threshold', 'status', 'date_modified')
+
+def _inventory_row(row):
+    row['status_text'] = InventoryItem.INV_STATUS_CHOICES.get(row['status'], "Unknown")
+    return row
+
 @login_required
 @allowed_roles(roles=ROLE_INVENTORY_ACCESS)
 @csrf_exempt
+@condition(etag_func=inventory_etag)
 def get_inventory_items(request):
-    """API endpoint to get all inventory items"""
-    items = InventoryItem.objects.all().order_by('name')
-    data = [{
-        'id': item.id,
-        'name': item.name,
-        'quantity': item.quantity,
-        'threshold': item.threshold,
-        'status': item.status,
-        'status_text': item.get_status_display()
-    } for item in items]
-    return JsonResponse(data, safe=False)
+    """
+    API endpoint to get inventory items.
+
+    Without paging parameters every item is returned as a plain list. Passing `limit` and/or `cursor`
+    switches to keyset pagination ordered by (sort, id), returning {'results', 'next_cursor'}.
+    Optional filters: `q` (name contains), `status` (comma separated codes). Sort with `sort=<field>`
+    or `sort=-<field>`.
+
+    `since=<token>` returns only the items changed and the ids deleted after the token, plus the
+    token for the next poll ({'items', 'deleted', 'token'}); `since=0` starts a full sync.
+    Responses carry an ETag, so an unchanged inventory answers If-None-Match with a 304.
+    """
+    since = request.GET.get('since')
+    if since is not None:
+        try:
+            since = decode_sync_token(since)
+        except (ValueError, OverflowError):
+            return JsonResponse({'success': False, 'error': 'Invalid sync token.'}, status=400)
+        changed, deleted, token = inventory_delta(since, INVENTORY_LIST_FIELDS)
+        return JsonResponse({
+            'items': [_inventory_row(row) for row in changed],
+            'deleted': deleted,
+            'token': token,
+        })
+
+    items = InventoryItem.objects.all()
+
+    search = request.GET.get('q', '').strip()
+    if search:
+        items = items.filter(name__icontains=search)
+    status_param = request.GET.get('status', '').strip()
+    if status_param:
+        try:
+            items = items.filter(status__in=[int(s) for s in status_param.split(',') if s.strip()])
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'status must be a comma separated list of integers.'}, status=400)
+
+    sort = request.GET.get('sort', 'name')
+    descending = sort.startswith('-')
+    sort_field = sort.lstrip('-')
+    if sort_field not in INVENTORY_SORT_FIELDS:
+        return JsonResponse({'success': False, 'error': f'Invalid sort field: {sort_field}'}, status=400)
+
+    fields = INVENTORY_LIST_FIELDS if sort_field in INVENTORY_LIST_FIELDS else INVENTORY_LIST_FIELDS + (sort_field,)
+    rows = items.values(*fields)
+
+    if 'limit' not in request.GET and 'cursor' not in request.GET:
+        # Full dump for callers that don't ask for pagination
+        rows = rows.order_by(f'-{sort_field}' if descending else sort_field, 'id')
+        return JsonResponse([_inventory_row(row) for row in rows], safe=False)
+
+    try:
+        limit = parse_limit(request.GET.get('limit'))
+        page, next_cursor = keyset_page(rows, sort_field, request.GET.get('cursor'), limit, descending=descending)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'results': [_inventory_row(row) for row in page],
+        'next_cursor': next_cursor,
+    })
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def search_inventory_items(request):
+    """
+    Ranked search over item names: `q` is matched as a prefix, as a substring and, from three
+    characters on, with typo tolerance. Paged with `page` and `limit`; returns
+    {'results', 'count', 'page', 'has_next'} where each result has a `match` kind and a `score`.
+    """
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=20, maximum=100)
+        page = int(request.GET.get('page') or 1)
+        if page < 1:
+            raise ValueError("page must be a positive integer.")
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    rows, count = search_inventory(request.GET.get('q', ''), (page - 1) * limit, limit, INVENTORY_LIST_FIELDS)
+    return JsonResponse({
+        'results': [_inventory_row(row) for row in rows],
+        'count': count,
+        'page': page,
+        'has_next': page * limit < count,
+    })
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def inventory_stock_at(request):
+    """
+    Stock at a past moment, from the stock ledger: `at` is an ISO 8601 date and time (naive values
+    are in the site time zone). With `item` returns {'at', 'item', 'quantity'}, otherwise
+    {'at', 'quantities': {item id: quantity}} for every item that existed at that moment.
+    """
+    try:
+        moment = parse_datetime(request.GET.get('at') or '')
+    except ValueError:
+        moment = None
+    if moment is None:
+        return JsonResponse({'success': False, 'error': "at must be an ISO 8601 date and time."}, status=400)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+
+    item_id = request.GET.get('item')
+    if item_id is None:
+        return JsonResponse({'at': moment, 'quantities': catalogue_stock_at(moment)})
+    if not item_id.isdigit():
+        return JsonResponse({'success': False, 'error': "item must be an item id."}, status=400)
+    if not InventoryItem.objects.filter(pk=item_id).exists():
+        return JsonResponse({'success': False, 'error': "Item not found."}, status=404)
+    return JsonResponse({'at': moment, 'item': int(item_id), 'quantity': stock_at(item_id, moment)})
+
+
+def metrics_view(request):
+    """
+    Request metrics of this worker process in Prometheus text format. Scrapers authenticate with
+    "Authorization: Bearer <METRICS_TOKEN>"; logged-in staff users can read it without the token.
+    """
+    token = settings.METRICS_TOKEN
+    authorized = bool(token) and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not (authorized or request.user.is_staff):
+        return HttpResponseForbidden("You are not authorized to view this page.")
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@login_required
+@allowed_roles(roles=ROLE_INVENTORY_ACCESS)
+def inventory_events(request):
+    """
+    Server-Sent Events stream of inventory changes (see core.events). Resumes after the sync token
+    in the Last-Event-ID header, or in `since` for the first connection (EventSource can't set
+    headers); without either only changes from now on are sent. Returns 503 when this process
+    already serves INVENTORY_STREAM_MAX_CLIENTS streams, and clients should fall back to polling.
+    """
+    token = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    try:
+        since = decode_sync_token(token) if token else timezone.now()
+    except (ValueError, OverflowError):
+        return JsonResponse({'success': False, 'error': 'Invalid sync token.'}, status=400)
+
+    if not acquire_stream_slot():
+        return JsonResponse({'success': False, 'error': 'Too many open inventory streams.'}, status=503)
+
+    response = StreamingHttpResponse(
+        InventoryStream(inventory_event_stream(since, INVENTORY_LIST_FIELDS, row_formatter=_inventory_row)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 @login_required
 @allowed_roles(roles=ROLE_INVENTORY_ACCESS)
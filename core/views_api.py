@@ -1,26 +1,66 @@
 # core/views_api.py
 from django.shortcuts import render
 from django.http import HttpResponse, JsonResponse
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Profile, InventoryItem, Supplier, Order, OrderItem, Report, Changelog, InventoryItemChanges
+from .models import Profile, InventoryItem, Supplier, Order, OrderItem, Report, Changelog, InventoryItemChanges, ChangeArchive
 from .serializers import ProfileSerializer, InventoryItemSerializer, SupplierSerializer, OrderSerializer, OrderItemSerializer, ReportSerializer, ChangelogSerializer, InventoryItemChangesSerializer
+from .serializers import InventoryItemListSerializer, SupplierListSerializer, OrderListSerializer, InventoryItemChangesListSerializer
 from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .dashboard import get_dashboard_snapshot, invalidate_dashboard_snapshot
+from .pagination import ChangeHistoryCursorPagination, parse_limit
+from .archive import read_archive
+from .list_cache import CachedListMixin, bump_list_generation
+from .conditional import ConditionalGetMixin
+from .adjustments import apply_adjustments, clean_adjustments
 
 
 def api_dashboard(request):
+    snapshot = get_dashboard_snapshot()
     data = {
-        'totalProducts': InventoryItem.objects.count(),
-        'totalAlerts': InventoryItem.objects.filter(status=InventoryItem.LOWSTOCK).count(),
-        'pendingOrders': Order.objects.filter(status='PENDING').count(),
+        'totalProducts': snapshot['total_products'],
+        'totalAlerts': snapshot['low_stock'],
+        'pendingOrders': snapshot['pending_orders'],
             'status': 200
     }
     return JsonResponse(data)
 
     #return HttpResponse("Hello world!")
 
+class ValuesListMixin:
+    """
+    Serves the list action through `list_serializer_class` (a ValuesListSerializer), which builds
+    rows from values() instead of model instances. Other actions use serializer_class as usual.
+    """
+    list_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.list_serializer_class()
+        page = self.paginate_queryset(serializer.values(queryset))
+        if page is not None:
+            return self.get_paginated_response(serializer.rows_from_values(page))
+        return Response(serializer.rows(queryset))
+
+class TrackedUpdateMixin:
+    """
+    Answers 404 when the row was deleted between loading and saving it, which a
+    TrackedFieldsMixin model reports as DoesNotExist from save().
+    """
+
+    def perform_update(self, serializer):
+        try:
+            super().perform_update(serializer)
+        except self.queryset.model.DoesNotExist:
+            raise NotFound()
+
 class ProfileListCreateAPIView(generics.ListCreateAPIView):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
@@ -31,33 +71,142 @@ class ProfileDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [AllowAny]  # Change this if you need to restrict access
 
-class ItemViewSet(viewsets.ModelViewSet):
+class ItemViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, TrackedUpdateMixin, viewsets.ModelViewSet):
     queryset = InventoryItem.objects.all()
     serializer_class = InventoryItemSerializer
+    list_serializer_class = InventoryItemListSerializer
 
-class SupplierViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['patch'])
+    def batch(self, request):
+        """
+        Adjust many items in one transaction: a list of {"id": ..., "quantity": n | "delta": +/-n,
+        "threshold": n}. Either every operation is applied or none is; the response has one result
+        per operation, in order.
+        """
+        try:
+            operations, errors = clean_adjustments(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if errors:
+            results = [
+                {'success': False, 'error': errors.get(index, 'Not applied; another operation in the batch is invalid.')}
+                for index in range(len(request.data))
+            ]
+            return Response({'applied': False, 'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+        applied, results = apply_adjustments(operations, user=request.user)
+        return Response({'applied': applied, 'results': results}, status=status.HTTP_200_OK if applied else status.HTTP_400_BAD_REQUEST)
+
+class SupplierViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, TrackedUpdateMixin, viewsets.ModelViewSet):
     queryset = Supplier.objects.all()
     serializer_class = SupplierSerializer
+    list_serializer_class = SupplierListSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['name','date_added','status']
 
-class OrderViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['patch'])
+    def bulk_update(self, request):
+        """Apply partial updates to many suppliers: a list of {"id": ..., <field>: <value>, ...}."""
+        if not isinstance(request.data, list) or not request.data:
+            return Response({'error': 'Expected a non-empty list of supplier updates.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        errors = {}
+        entries = []
+        for entry in request.data:
+            if not isinstance(entry, dict):
+                errors[str(entry)] = ['Each update must be an object.']
+                continue
+            raw_id = entry.get('id')
+            # JSON clients may send ids as strings; in_bulk() is keyed by int
+            try:
+                if isinstance(raw_id, (bool, float)):
+                    raise ValueError
+                pk = int(raw_id)
+            except (TypeError, ValueError):
+                errors[str(raw_id)] = ['id must be an integer.']
+                continue
+            entries.append((pk, entry))
+
+        suppliers = Supplier.objects.in_bulk([pk for pk, _ in entries])
+        fields = set()
+        for pk, entry in entries:
+            supplier = suppliers.get(pk)
+            if supplier is None:
+                errors[str(pk)] = ['Supplier not found.']
+                continue
+            serializer = self.get_serializer(supplier, data=entry, partial=True)
+            if not serializer.is_valid():
+                errors[str(supplier.pk)] = serializer.errors
+                continue
+            for field_name, value in serializer.validated_data.items():
+                setattr(supplier, field_name, value)
+                fields.add(field_name)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        updated = list(suppliers.values())
+        audited = Supplier.bulk_update_audited(updated, fields) if fields else 0
+        # bulk_update() doesn't send the save signals that refresh the dashboard and lists
+        invalidate_dashboard_snapshot()
+        bump_list_generation(Supplier)
+        return Response({'updated': len(updated), 'changelog_entries': audited})
+
+class OrderViewSet(ConditionalGetMixin, CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    list_serializer_class = OrderListSerializer
 
 class OrderItemViewSet(viewsets.ModelViewSet):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['order', 'item']
 
 class ChangelogViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Changelog.objects.all()
     serializer_class = ChangelogSerializer
 
-class InventoryItemChangesViewSet(viewsets.ModelViewSet):
+def _query_datetime(params, key):
+    """Parse an optional ISO datetime query parameter; naive values are taken as the current time zone."""
+    value = params.get(key)
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(f"Invalid {key}.")
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+class InventoryItemChangesViewSet(ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    queryset = InventoryItemChanges.objects.all()
+    # The serializer adds the item and user names, so join them instead of loading each per row
+    queryset = InventoryItemChanges.objects.select_related('item', 'executing_user')
     serializer_class = InventoryItemChangesSerializer
+    list_serializer_class = InventoryItemChangesListSerializer
+    pagination_class = ChangeHistoryCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        'item': ['exact'],
+        'executing_user': ['exact'],
+        'date_executed': ['gte', 'lte'],
+    }
+
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """
+        Change rows already moved to the archive, newest first. Query parameters: item (id),
+        start/end (ISO datetimes, inclusive) and limit (default 100, at most 1000).
+        """
+        try:
+            start = _query_datetime(request.query_params, 'start')
+            end = _query_datetime(request.query_params, 'end')
+            item_id = int(request.query_params['item']) if request.query_params.get('item') else None
+            limit = parse_limit(request.query_params.get('limit'))
+        except ValueError:
+            return Response({'error': 'Invalid start, end, item or limit.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = read_archive(ChangeArchive.INVENTORY_CHANGES, start=start, end=end, item_id=item_id, limit=limit + 1)
+        return Response({'results': rows[:limit], 'truncated': len(rows) > limit})
 
 class ReportViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
@@ -36,8 +36,9 @@ worker_class = "gthread"
 # https://devcenter.heroku.com/articles/python-concurrency
 workers = os.environ.get("WEB_CONCURRENCY", 1)
 
-# Each `gthread` worker process will use a pool of this many threads.
-threads = 5
+# Each `gthread` worker process will use a pool of this many threads. Django's settings read
+# the same variable to size the inventory event stream limit.
+threads = int(os.environ.get("WEB_THREADS", 5))
 
 # Workers silent for more than this many seconds are killed and restarted.
 # Note: This only affects the maximum request time when using the `sync` worker.
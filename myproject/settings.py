@@ -31,6 +31,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-view latency and query metrics (served at /metrics); first so it times the whole stack
+    'core.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # Django doesn't support serving static assets in a production-ready way, so we use the
     # excellent WhiteNoise package to do so instead. The WhiteNoise middleware must be listed
@@ -146,6 +148,36 @@ DEFAULT_FROM_EMAIL = 'ECIMS Support <odai.alkhatib@gmail.com>'
 # Password Reset Settings
 PASSWORD_RESET_TIMEOUT = 14400  # 4 hours in seconds
 
+# Change history older than this many days is moved into compressed archive rows
+# by the archive_changelogs management command
+CHANGELOG_RETENTION_DAYS = int(os.environ.get('CHANGELOG_RETENTION_DAYS', 365))
+
+# Request threads per gunicorn worker; gunicorn.conf.py reads the same variable
+WEB_THREADS = int(os.environ.get('WEB_THREADS', 5))
+
+# Each open inventory event stream (SSE) holds a server thread; past this many per process,
+# clients fall back to polling. At least three threads are always left for ordinary requests.
+INVENTORY_STREAM_MAX_CLIENTS = max(0, min(
+    int(os.environ.get('INVENTORY_STREAM_MAX_CLIENTS', WEB_THREADS - 3)),
+    WEB_THREADS - 3,
+))
+
+# Cached API list responses are rebuilt at least this often. With the default per-process memory
+# cache this bounds how long another worker can serve a list from before a change
+LIST_CACHE_TTL = int(os.environ.get('LIST_CACHE_TTL', 60))
+
+# Point CACHE_DIR at a directory to share the cache between the worker processes of a host
+if os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+
+# Bearer token a Prometheus scraper sends to read /metrics; without it only staff users can
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -156,8 +188,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson-based JSON; the browsable API is only offered outside production
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',  # useful for development
-    ],
+        'core.renderers.FastJSONRenderer',
+    ] + ([] if IS_HEROKU_APP else ['rest_framework.renderers.BrowsableAPIRenderer']),
 }
\ No newline at end of file